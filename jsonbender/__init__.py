@@ -1,9 +1,53 @@
-from jsonbender.core import Bender, K, bend, BendingException
-from jsonbender.list_ops import FlatForall, Forall, Filter, Reduce
-from jsonbender.string_ops import Format
-from jsonbender.selectors import F, S, OptionalS
-from jsonbender.control_flow import Alternation, If, Switch
+import sys
+from importlib import import_module
 
 
 __version__ = '0.9.3'
 
+# Public names and the submodules defining them. They are imported lazily, on
+# first access, so that `import jsonbender` stays cheap.
+_exports = {
+    'jsonbender.core': ['Bender', 'K', 'Merge', 'Omit', 'OMIT', 'Scope',
+                        'bend', 'BendingException'],
+    'jsonbender.list_ops': ['FlatForall', 'Forall', 'Filter', 'Reduce',
+                            'Count', 'Sum', 'Min', 'Max', 'Any', 'All',
+                            'Distinct', 'GroupBy', 'IndexBy', 'Join'],
+    'jsonbender.string_ops': ['Format'],
+    'jsonbender.selectors': ['F', 'S', 'OptionalS'],
+    'jsonbender.control_flow': ['Alternation', 'If', 'Switch', 'When',
+                                'OmitIfMissing'],
+    'jsonbender.batch': ['bend_columns', 'bend_file', 'bend_many'],
+    'jsonbender.stream': ['abend_stream'],
+    'jsonbender.validation': ['check'],
+}
+_modules = {name: module
+            for module, names in _exports.items()
+            for name in names}
+
+__all__ = sorted(_modules)
+
+# Submodules, also imported on first access (`jsonbender.list_ops.Forall`).
+_submodules = sorted({module.rpartition('.')[2] for module in _exports} |
+                     {'engine', 'metrics', 'test'})
+
+
+def _load(name):
+    value = getattr(import_module(_modules[name]), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _submodules:
+            return import_module('{}.{}'.format(__name__, name))
+        if name not in _modules:
+            raise AttributeError('module {!r} has no attribute {!r}'
+                                 .format(__name__, name))
+        return _load(name)
+
+    def __dir__():
+        return sorted(set(globals()) | set(__all__))
+else:  # no module __getattr__ (PEP 562), import everything eagerly
+    for _name in __all__:
+        _load(_name)
@@ -0,0 +1,383 @@
+from array import array
+from collections import namedtuple
+from keyword import iskeyword
+from time import perf_counter
+import json
+import os
+import sys
+
+from jsonbender import metrics
+from jsonbender.core import OMIT, BendingException, Dict, benderify
+
+
+class Columns(dict):
+    """
+    Result of `bend_columns()`: a dict mapping each key of the mapping to its
+    column.
+
+    `nulls` maps the name of each typed column that had null (None) values to
+    a bytearray validity mask, Arrow-style: 1 for a valid value, 0 for a null.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(Columns, self).__init__(*args, **kwargs)
+        self.nulls = {}
+
+
+def _null_fill(typecode):
+    return float('nan') if typecode in 'fd' else 0
+
+
+def _array_column(values, typecode):
+    fill = _null_fill(typecode)
+    mask = None
+    if None in values:
+        mask = bytearray(v is not None for v in values)
+        values = [fill if v is None else v for v in values]
+    return array(typecode, values), mask
+
+
+def _numpy_column(values, typecode):
+    import numpy
+    if None in values:
+        mask = [v is None for v in values]
+        fill = _null_fill(typecode)
+        values = [fill if v is None else v for v in values]
+        return numpy.ma.masked_array(values, mask=mask, dtype=typecode), None
+    return numpy.array(values, dtype=typecode), None
+
+
+def _pyarrow_column(values, type_):
+    import pyarrow
+    return pyarrow.array(values, type=type_), None
+
+
+_BACKENDS = {
+    'array': _array_column,
+    'numpy': _numpy_column,
+    'pyarrow': _pyarrow_column,
+}
+
+
+def bend_columns(mapping, sources, types=None, backend='array'):
+    """
+    Bend many sources with a flat dict mapping and return the result as
+    columns instead of a list of dicts.
+
+    mapping: a dict mapping (or a `Dict` bender)
+    sources: an iterable of source dicts
+    types: a dict from keys of the mapping to column types. For the `array`
+        and `numpy` backends these are `array.array` typecodes ('q', 'd'
+        etc.); for the `pyarrow` backend, pyarrow data types.
+        Keys without a type are returned as plain lists.
+    backend: one of 'array', 'numpy' or 'pyarrow'. numpy and pyarrow are
+        only imported when used.
+
+    Omitted values (see OMIT) are returned as nulls.
+    Nulls (e.g. the default of an `OptionalS`) in typed columns are replaced
+    by NaN (float typecodes) or 0 and recorded in the `nulls` validity masks
+    of the result when using the `array` backend. The numpy backend returns
+    masked arrays instead, and pyarrow handles nulls natively.
+
+    returns a `Columns` dict.
+    """
+    sources = list(sources)
+    hook = metrics.hook
+    if hook is None:
+        return _bend_columns(mapping, sources, types, backend)
+    return metrics.observe(hook, 'bend_columns', mapping, len(sources),
+                           _bend_columns, mapping, sources, types, backend)
+
+
+def _bend_columns(mapping, sources, types, backend):
+    bender = benderify(mapping)
+    if not isinstance(bender, Dict):
+        raise ValueError('bend_columns() needs a dict mapping')
+    try:
+        make_column = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError('Unknown backend: {}'.format(backend))
+    types = types or {}
+
+    res = Columns()
+    for k, v in bender.dict.items():
+        try:
+            values = [v.bend(source) for source in sources]
+        except Exception as e:
+            raise BendingException.wrap(k, e)
+        values = [None if x is OMIT else x for x in values]
+        if k in types:
+            try:
+                values, mask = make_column(values, types[k])
+            except (TypeError, ValueError, OverflowError) as e:
+                # a value which doesn't fit the column type
+                raise BendingException.wrap(k, e)
+            if mask is not None:
+                res.nulls[k] = mask
+        res[k] = values
+    return res
+
+
+class Record(object):
+    """
+    Base class of the record classes generated by `bend_many()`.
+    `_fields` is the tuple of the field names.
+    """
+    __slots__ = ()
+
+    def to_dict(self):
+        """Return the record (and its nested records) as a dict."""
+        return {k: _to_dict(getattr(self, k)) for k in self._fields}
+
+
+def _to_dict(value):
+    return value.to_dict() if isinstance(value, Record) else value
+
+
+class SlotsRecord(Record):
+    """Base class of the `__slots__` record classes."""
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for k, v in zip(self._fields, values):
+            setattr(self, k, v)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k)
+                   for k in self._fields)
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(k, getattr(self, k))
+                      for k in self._fields))
+
+
+def _tuple_record(name, fields):
+    return type(name, (namedtuple(name, fields), Record), {'__slots__': ()})
+
+
+def _slots_record(name, fields):
+    return type(name, (SlotsRecord,), {'__slots__': fields,
+                                       '_fields': fields})
+
+
+def _dataclass_record(name, fields):
+    from dataclasses import make_dataclass
+    # Before Python 3.10 dataclasses can't have slots: records have a
+    # __dict__, like any class instance.
+    kwargs = {'slots': True} if sys.version_info >= (3, 10) else {}
+    cls = make_dataclass(name, fields, bases=(Record,), **kwargs)
+    cls._fields = fields
+    return cls
+
+
+_RECORD_TYPES = {
+    'tuple': _tuple_record,
+    'slots': _slots_record,
+    'dataclass': _dataclass_record,
+}
+
+# Attributes of Record, which fields would shadow.
+_RESERVED_FIELDS = frozenset(['to_dict', '_fields'])
+
+
+class RecordBuilder(Dict):
+    """
+    Bends a `Dict` into instances of a record class generated from its keys
+    (nested Dicts become nested record classes) instead of dicts.
+    `type` is the generated class. Omitted values (see OMIT) become None.
+
+    dict_bender: the `Dict` to take the keys and benders from
+    output: the kind of record class, one of 'tuple' (a namedtuple),
+        'slots' (a class with `__slots__`) or 'dataclass'
+    """
+
+    def __init__(self, dict_bender, output, name='Record'):
+        try:
+            make_type = _RECORD_TYPES[output]
+        except KeyError:
+            raise ValueError('Unknown output: {}'.format(output))
+        for k in dict_bender.keys:
+            if not (isinstance(k, str) and k.isidentifier()) or iskeyword(k):
+                raise ValueError('Invalid record field name: {!r}'.format(k))
+            if k in _RESERVED_FIELDS:
+                raise ValueError('Record field name {!r} is reserved'
+                                 .format(k))
+            if output == 'tuple' and k.startswith('_'):
+                raise ValueError('Tuple record field names cannot start '
+                                 'with an underscore: {!r}'.format(k))
+        super(RecordBuilder, self).__init__({
+            k: (RecordBuilder(v, output, '{}_{}'.format(name, k))
+                if isinstance(v, Dict) else v)
+            for k, v in dict_bender.dict.items()
+        })
+        self.type = make_type(name, self.keys)
+
+    def bend(self, source):
+        values = self.bend_values(source)
+        return self.type(*[None if v is OMIT else v for v in values])
+
+
+def bend_many(mapping, sources, output='dict'):
+    """
+    Bend each of the sources with the mapping.
+
+    mapping: the map of benders, as passed to `bend()`
+    sources: an iterable of sources
+    output: 'dict' (the default) returns dicts, like `bend()`.
+        For a dict mapping, 'tuple', 'slots' or 'dataclass' return instances
+        of a record class generated from its keys, which take much less
+        memory than dicts (except 'dataclass' records before Python 3.10,
+        which have a `__dict__`). Records have a `to_dict()` method.
+
+    returns a list with the results.
+    """
+    sources = list(sources)
+    hook = metrics.hook
+    if hook is None:
+        return _bend_many(mapping, sources, output)
+    return metrics.observe(hook, 'bend_many', mapping, len(sources),
+                           _bend_many, mapping, sources, output)
+
+
+def _bend_many(mapping, sources, output):
+    bender = benderify(mapping)
+    if output != 'dict':
+        if not isinstance(bender, Dict):
+            raise ValueError('Record output needs a dict mapping')
+        bender = RecordBuilder(bender, output)
+    bend = bender.bend
+    return [bend(source) for source in sources]
+
+
+def _split_lines(path, parts):
+    """
+    Split the file in up to `parts` (start, end) byte ranges, each ending
+    right after a newline (or at the end of the file).
+    """
+    import mmap
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    bounds = [0]
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for i in range(1, parts):
+                pos = m.find(b'\n', max(size * i // parts, bounds[-1]))
+                if pos == -1 or pos + 1 >= size:
+                    break
+                bounds.append(pos + 1)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _bend_range(bender, path, start, end, out_path):
+    """
+    Parse the JSON lines of `path` between the byte offsets `start` and
+    `end`, bend them and write the results to `out_path`, as JSON lines.
+    Returns the number of records bent.
+    """
+    import mmap
+    count = 0
+    with open(path, 'rb') as f, open(out_path, 'w') as out:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            pos = start
+            while pos < end:
+                nl = m.find(b'\n', pos, end)
+                if nl == -1:
+                    nl = end
+                line = m[pos:nl]
+                pos = nl + 1
+                if line.strip():
+                    res = bender.bend(json.loads(line.decode('utf-8')))
+                    out.write(json.dumps(res))
+                    out.write('\n')
+                    count += 1
+    return count
+
+
+_worker_bender = None
+
+
+def _init_worker(mapping):
+    global _worker_bender
+    _worker_bender = benderify(mapping)
+
+
+def _bend_range_worker(path, start, end, out_path):
+    return _bend_range(_worker_bender, path, start, end, out_path)
+
+
+def bend_file(mapping, path, out_path, workers=None, start_method=None):
+    """
+    Bend a JSON Lines file into another one, in parallel.
+
+    The input file is memory-mapped and split into byte ranges on newline
+    boundaries. Each of the `workers` processes (defaults to the number of
+    CPUs) parses and bends its own ranges and writes the results into a
+    temporary file; these are concatenated in order into `out_path`.
+    No records are pickled between processes.
+
+    mapping: the map of benders, as passed to `bend()`
+    path: the input file, one JSON document per line
+    out_path: the output file, one JSON document per line
+    workers: the number of processes. With 1 no processes are started.
+    start_method: the multiprocessing start method of the workers ('fork',
+        'spawn' or 'forkserver'), defaults to the platform's default.
+        Except with 'fork', the mapping is pickled to the workers, so it
+        must be picklable (e.g. no lambdas in `F`).
+
+    returns the number of records bent.
+    """
+    hook = metrics.hook
+    start = perf_counter()
+    try:
+        count = _bend_file(mapping, path, out_path,
+                           workers or os.cpu_count() or 1, start_method)
+    except Exception as e:
+        if hook is not None:
+            hook.record('bend_file', mapping, 0, perf_counter() - start, e)
+        raise
+    if hook is not None:
+        hook.record('bend_file', mapping, count, perf_counter() - start)
+    return count
+
+
+def _bend_file(mapping, path, out_path, workers, start_method):
+    import shutil
+    import tempfile
+    ranges = _split_lines(path, workers)
+    tmp_dir = tempfile.mkdtemp(
+        dir=os.path.dirname(os.path.abspath(out_path)))
+    try:
+        chunks = [(path, start, end, os.path.join(tmp_dir, str(i)))
+                  for i, (start, end) in enumerate(ranges)]
+        if workers == 1 or len(chunks) <= 1:
+            bender = benderify(mapping)
+            counts = [_bend_range(bender, *chunk) for chunk in chunks]
+        else:
+            import multiprocessing
+            context = multiprocessing.get_context(start_method)
+            pool = context.Pool(min(workers, len(chunks)), _init_worker,
+                                (mapping,))
+            try:
+                counts = pool.starmap(_bend_range_worker, chunks)
+            finally:
+                pool.terminate()
+                pool.join()
+        with open(out_path, 'wb') as out:
+            for chunk in chunks:
+                with open(chunk[-1], 'rb') as f:
+                    shutil.copyfileobj(f, out)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return sum(counts)
@@ -1,4 +1,4 @@
-from jsonbender.core import Bender, K
+from jsonbender.core import Bender, K, MISSING, OMIT, benderify
 
 
 class If(Bender):
@@ -30,6 +30,14 @@ class If(Bender):
                 if self.condition.bend(val)
                 else self.when_false.bend(val))
 
+    def probe(self, val):
+        condition = self.condition.probe(val)
+        if condition is MISSING:
+            return MISSING
+        return (self.when_true.probe(val)
+                if condition
+                else self.when_false.probe(val))
+
 
 class Alternation(Bender):
     """
@@ -52,16 +60,23 @@ class Alternation(Bender):
         self.benders = benders
 
     def bend(self, source):
-        exc = ValueError()
+        if not self.benders:
+            raise ValueError()
+        for bender in self.benders[:-1]:
+            result = bender.probe(source)
+            if result is not MISSING:
+                return result
+        # The last bender is bent, so that its LookupError propagates.
+        return self.benders[-1].bend(source)
+
+    def probe(self, source):
+        if not self.benders:
+            raise ValueError()
         for bender in self.benders:
-            try:
-                result = bender.bend(source)
-            except LookupError as e:
-                exc = e
-            else:
+            result = bender.probe(source)
+            if result is not MISSING:
                 return result
-        else:
-            raise exc
+        return MISSING
 
 
 class Switch(Bender):
@@ -93,15 +108,73 @@ class Switch(Bender):
         self.cases = cases
         self.default = default
 
+    def _case(self, key):
+        if type(self.cases) is dict:
+            bender = self.cases.get(key, MISSING)
+        else:
+            try:
+                bender = self.cases[key]
+            except LookupError:
+                bender = MISSING
+        if bender is MISSING and self.default is not None:
+            return self.default
+        return bender
+
     def bend(self, source):
         key = self.key_bender.bend(source)
-        try:
-            bender = self.cases[key]
-        except LookupError:
-            if self.default:
-                bender = self.default
-            else:
-                raise
-
+        bender = self._case(key)
+        if bender is MISSING:
+            self.cases[key]  # raise the original LookupError
         return bender.bend(source)
 
+    def probe(self, source):
+        key = self.key_bender.probe(source)
+        if key is MISSING:
+            return MISSING
+        bender = self._case(key)
+        if bender is MISSING:
+            return MISSING
+        return bender.probe(source)
+
+
+class When(Bender):
+    """
+    Takes a guard bender and a bender. If the guard evaluates to true,
+    return the value of the bender. Otherwise return OMIT without bending
+    it, so that the key of the Dict it's bent for is left out.
+
+    Example:
+    ```
+    mapping = {'name': S('name'),
+               'company': When(S('is_business'), {'name': S('company')})}
+    bend(mapping, {'name': 'Li', 'is_business': False})  # -> {'name': 'Li'}
+    ```
+    """
+
+    def __init__(self, guard, bender):
+        self.guard = guard
+        self.bender = benderify(bender)
+
+    def bend(self, source):
+        return self.bender.bend(source) if self.guard.bend(source) else OMIT
+
+
+class OmitIfMissing(Bender):
+    """
+    Takes a bender and returns its value, or OMIT if it raises a
+    LookupError (KeyError, IndexError etc.), so that the key of the Dict
+    it's bent for is left out.
+
+    Example:
+    ```
+    mapping = {'name': S('name'), 'email': OmitIfMissing(S('email'))}
+    bend(mapping, {'name': 'Li'})  # -> {'name': 'Li'}
+    ```
+    """
+
+    def __init__(self, bender):
+        self.bender = benderify(bender)
+
+    def bend(self, source):
+        value = self.bender.probe(source)
+        return OMIT if value is MISSING else value
@@ -1,3 +1,47 @@
+import operator
+
+from jsonbender import metrics
+
+
+class _Missing(object):
+    def __repr__(self):
+        return 'MISSING'
+
+    def __bool__(self):
+        return False
+
+    __nonzero__ = __bool__
+
+
+MISSING = _Missing()
+"""Returned by Bender.probe() when the value isn't found."""
+
+
+class _Omit(object):
+    def __repr__(self):
+        return 'OMIT'
+
+
+OMIT = _Omit()
+"""When a bender of a Dict returns OMIT, the key is left out of the result."""
+
+
+def lookup(source, key):
+    """
+    Return source[key] or MISSING if it doesn't exist, without raising
+    (and catching) a LookupError for plain dicts, lists and tuples.
+    """
+    type_ = type(source)
+    if type_ is dict:
+        return source.get(key, MISSING)
+    if (type_ is list or type_ is tuple) and type(key) is int:
+        return source[key] if -len(source) <= key < len(source) else MISSING
+    try:
+        return source[key]
+    except LookupError:
+        return MISSING
+
+
 class Bender(object):
 
     """
@@ -9,6 +53,11 @@ class Bender(object):
     All bending logic should be there.
 
     Subclasses must implement __init__() and bend() methods.
+
+    Benders that select values may also implement probe(), which behaves
+    like bend() but returns MISSING instead of raising a LookupError. It's
+    used by fallback benders (like OptionalS and Alternation) to avoid the
+    cost of raising and catching exceptions.
     """
 
     def __init__(self, *args, **kwargs):
@@ -17,6 +66,12 @@ class Bender(object):
     def bend(self, source):
         raise NotImplementedError()
 
+    def probe(self, source):
+        try:
+            return self.bend(source)
+        except LookupError:
+            return MISSING
+
     def __eq__(self, other):
         return Eq(self, other)
 
@@ -51,7 +106,26 @@ class Bender(object):
         return Div(self, other)
 
     def __floordiv__(self, other):
-        return Div(self, other)
+        return FloorDiv(self, other)
+
+    def __lt__(self, other):
+        return Lt(self, other)
+
+    def __le__(self, other):
+        return Le(self, other)
+
+    def __gt__(self, other):
+        return Gt(self, other)
+
+    def __ge__(self, other):
+        return Ge(self, other)
+
+    def isin(self, other):
+        """
+        Return a bender checking whether the value is in `other`'s value.
+        (`in` can't be overloaded to return a bender.)
+        """
+        return In(self, other)
 
     def __rshift__(self, other):
         return Compose(self, other)
@@ -74,30 +148,102 @@ class K(Bender):
         return self._val
 
 
+class Omit(K):
+    """
+    Returns OMIT, so that the key of a Dict it's bent for is left out.
+
+    Example:
+    ```
+    bend({'a': K(1), 'b': Omit()}, {})  # -> {'a': 1}
+    ```
+    """
+    def __init__(self):
+        super(Omit, self).__init__(OMIT)
+
+
 class List(Bender):
-    """Bender wrapper for lists."""
+    """
+    Bender wrapper for lists.
+    Elements whose bender returns OMIT are left out of the result.
+    """
 
     def __init__(self, list_):
         self.list = [benderify(v) for v in list_]
 
     def bend(self, source):
-        return [v.bend(source) for v in self.list]
+        res = [v.bend(source) for v in self.list]
+        return [v for v in res if v is not OMIT]
 
 
 class Dict(Bender):
-    """Bender wrapper for dicts."""
+    """
+    Bender wrapper for dicts.
+
+    The output keys are known when the Dict is created: `keys` is a tuple of
+    them, in the order of the mapping, which is also the order of the keys
+    of the results. bend_values() returns the bent values in that order,
+    without building a dict.
+
+    Keys whose bender returns OMIT are left out of the result of bend()
+    (but not of bend_values()).
+    """
 
     def __init__(self, dict_):
         self.dict = {k: benderify(v) for k, v in dict_.items()}
+        self.keys = tuple(self.dict)
+        self._items = tuple(self.dict.items())
+
+    def bend_values(self, source):
+        values = []
+        append = values.append
+        k = None
+        try:
+            for k, bender in self._items:
+                append(bender.bend(source))
+        except Exception as e:
+            raise BendingException.wrap(k, e)
+        return values
 
     def bend(self, source):
         res = {}
-        for k, v in self.dict.items():
-            try:
-                res[k] = v.bend(source)
-            except Exception as e:
-                m = 'Error for key {}: {}'.format(k, str(e))
-                raise BendingException(m)
+        k = None
+        try:
+            for k, bender in self._items:
+                value = bender.bend(source)
+                if value is not OMIT:
+                    res[k] = value
+        except Exception as e:
+            raise BendingException.wrap(k, e)
+        return res
+
+
+class Merge(Bender):
+    """
+    Shallow-merges the dicts returned by the given benders, from left to right.
+
+    The first dict is eagerly shallow-copied with `dict()` (at C level, but
+    in time linear in its size; this isn't a copy-on-write view) and the
+    following ones are overlaid on the copy, so the values of all keys that
+    are not overwritten are shared with the source instead of being rebuilt
+    by a `Dict` mapping. Neither of the merged dicts is modified.
+
+    Example:
+    ```
+    m = Merge(S('payload'), {'id': S('payload', 'id') >> F(int)})
+    m.bend({'payload': {'id': '1', 'name': 'x'}})  # -> {'id': 1, 'name': 'x'}
+    ```
+    """
+
+    def __init__(self, *benders):
+        if not benders:
+            raise ValueError('No benders given')
+        self.benders = [benderify(b) for b in benders]
+
+    def bend(self, source):
+        first, rest = self.benders[0], self.benders[1:]
+        res = dict(first.bend(source))
+        for bender in rest:
+            res.update(bender.bend(source))
         return res
 
 
@@ -108,14 +254,51 @@ class GetItem(Bender):
     def bend(self, value):
         return value[self._index]
 
+    def probe(self, value):
+        return lookup(value, self._index)
+
 
 class Compose(Bender):
+    """
+    Bends the result of `first` with `second`. If `first` returns OMIT, so
+    does the composition, without bending `second`.
+    """
+
     def __init__(self, first, second):
         self._first = benderify(first)
         self._second = benderify(second)
 
     def bend(self, source):
-        return self._second.bend(self._first.bend(source))
+        value = self._first.bend(source)
+        if value is OMIT:
+            return OMIT
+        return self._second.bend(value)
+
+    def probe(self, source):
+        value = self._first.probe(source)
+        if value is MISSING or value is OMIT:
+            return value
+        return self._second.probe(value)
+
+
+class Scope(Compose):
+    """
+    Bends the value selected by `selector` with a (sub-)mapping.
+
+    The mapping is turned into benders once, when the Scope is created, and
+    becomes part of the parent bender tree: no nested `bend()` call happens
+    at bending time. Use it to reuse sub-mappings (addresses, persons...)
+    instead of calling `bend()` inside an `F`.
+
+    Example:
+    ```
+    ADDRESS = {'city': S('city'), 'zip': S('postal_code')}
+    MAPPING = {'home': Scope(S('addresses', 'home'), ADDRESS)}
+    ```
+    """
+
+    def __init__(self, selector, mapping):
+        super(Scope, self).__init__(selector, mapping)
 
 
 class UnaryOperator(Bender):
@@ -127,7 +310,9 @@ class UnaryOperator(Bender):
     *value* (that is, the bender is implicitly activated).
 
     Subclasses must implement the op() method, which takes one value and
-    should return the desired result.
+    should return the desired result. It may also be a function from the
+    `operator` module, wrapped in staticmethod(), which avoids a Python
+    level call.
     """
 
     def __init__(self, bender):
@@ -141,13 +326,11 @@ class UnaryOperator(Bender):
 
 
 class Neg(UnaryOperator):
-    def op(self, v):
-        return -v
+    op = staticmethod(operator.neg)
 
 
 class Invert(UnaryOperator):
-    def op(self, v):
-        return not v
+    op = staticmethod(operator.not_)
 
 
 class BinaryOperator(Bender):
@@ -159,7 +342,13 @@ class BinaryOperator(Bender):
     *values* (that is, the benders are implicitly activated).
 
     Subclasses must implement the op() method, which takes two values and
-    should return the desired result.
+    should return the desired result. It may also be a function from the
+    `operator` module, wrapped in staticmethod(), which avoids a Python
+    level call.
+
+    Constant operands (K benders, e.g. the 100 in `S('x') * 100`) are
+    bent like any other bender; `engine.ClosureEngine` captures their values
+    instead.
     """
 
     def __init__(self, bender1, bender2):
@@ -175,18 +364,15 @@ class BinaryOperator(Bender):
 
 
 class Add(BinaryOperator):
-    def op(self, v1, v2):
-        return v1 + v2
+    op = staticmethod(operator.add)
 
 
 class Sub(BinaryOperator):
-    def op(self, v1, v2):
-        return v1 - v2
+    op = staticmethod(operator.sub)
 
 
 class Mul(BinaryOperator):
-    def op(self, v1, v2):
-        return v1 * v2
+    op = staticmethod(operator.mul)
 
 
 class Div(BinaryOperator):
@@ -194,14 +380,38 @@ class Div(BinaryOperator):
         return float(v1) / float(v2)
 
 
+class FloorDiv(BinaryOperator):
+    op = staticmethod(operator.floordiv)
+
+
 class Eq(BinaryOperator):
-    def op(self, v1, v2):
-        return v1 == v2
+    op = staticmethod(operator.eq)
 
 
 class Ne(BinaryOperator):
+    op = staticmethod(operator.ne)
+
+
+class Lt(BinaryOperator):
+    op = staticmethod(operator.lt)
+
+
+class Le(BinaryOperator):
+    op = staticmethod(operator.le)
+
+
+class Gt(BinaryOperator):
+    op = staticmethod(operator.gt)
+
+
+class Ge(BinaryOperator):
+    op = staticmethod(operator.ge)
+
+
+class In(BinaryOperator):
+    """Checks whether the first value is in the second one."""
     def op(self, v1, v2):
-        return v1 != v2
+        return v1 in v2
 
 
 class And(BinaryOperator):
@@ -215,7 +425,50 @@ class Or(BinaryOperator):
 
 
 class BendingException(Exception):
-    pass
+    """
+    Raised when bending fails.
+
+    `path` is the tuple of dict keys leading to the failure, outermost
+    first, and `key` the outermost of them (None if unknown). The original
+    exception, if any, is the `__cause__`.
+    The message is only rendered when the exception is converted to a
+    string, so failures that are caught and handled stay cheap.
+    """
+    def __init__(self, message=None, path=()):
+        super(BendingException, self).__init__(message)
+        self.message = message
+        self.path = tuple(path)
+
+    @classmethod
+    def wrap(cls, key, exc):
+        """
+        Return the exception to raise when bending `key` failed with `exc`:
+        `exc` itself with `key` prepended to its path, if it is a
+        BendingException, or a new BendingException caused by it.
+        """
+        if isinstance(exc, BendingException):
+            exc.path = (key,) + exc.path
+            return exc
+        new = cls(path=(key,))
+        new.__cause__ = exc
+        return new
+
+    @property
+    def key(self):
+        return self.path[0] if self.path else None
+
+    def _message(self):
+        if self.message is not None:
+            return self.message
+        return '' if self.__cause__ is None else str(self.__cause__)
+
+    def __str__(self):
+        return ''.join('Error for key {}: '.format(k)
+                       for k in self.path) + self._message()
+
+    def __reduce__(self):
+        # The cause isn't pickled, keep its message.
+        return type(self), (self._message(), self.path)
 
 
 def benderify(mapping):
@@ -241,4 +494,8 @@ def bend(mapping, source):
 
     returns a new dict according to the provided map.
     """
-    return benderify(mapping).bend(source)
+    hook = metrics.hook
+    if hook is None:
+        return benderify(mapping).bend(source)
+    return metrics.observe(hook, 'bend', mapping, 1,
+                           benderify(mapping).bend, source)
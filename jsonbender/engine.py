@@ -0,0 +1,210 @@
+"""
+Evaluation engines.
+
+An engine turns a mapping into a function of the source, which returns the
+same result as bending it (`bend(mapping, source)`). How each bender class
+is evaluated is looked up in the engine's dispatch table, where handlers
+are registered per bender class:
+
+    @MyEngine.register(MyBender)
+    def compile_my_bender(engine, bender):
+        inner = engine.compile(bender.inner)
+        return lambda source: inner(source) * 2
+
+Handlers are looked up by the exact class of the bender, so subclasses
+(which may override bend()) aren't evaluated by the handler of their base
+class. Benders without a handler are evaluated by their bend() method,
+which makes the reference engine, Bender.bend(), the fallback of every
+engine.
+"""
+from time import perf_counter
+
+from jsonbender.control_flow import If
+from jsonbender.core import (OMIT, Add, And, BendingException, Compose, Dict,
+                             Div, Eq, FloorDiv, Ge, GetItem, Gt, In, Invert,
+                             K, Le, List, Lt, Mul, Ne, Neg, Or, Scope, Sub,
+                             benderify)
+from jsonbender.list_ops import ForallBend
+from jsonbender.selectors import F, S
+
+
+class Engine(object):
+    """
+    Base class of the evaluation engines. Each subclass has its own
+    dispatch table (`handlers`), which starts as a copy of its base's.
+    """
+
+    handlers = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super(Engine, cls).__init_subclass__(**kwargs)
+        cls.handlers = dict(cls.handlers)
+
+    @classmethod
+    def register(cls, *bender_classes):
+        """
+        Decorator registering a handler for the given bender classes.
+        The handler takes the engine and a bender and returns a function of
+        the source.
+        """
+        def decorator(handler):
+            for bender_cls in bender_classes:
+                cls.handlers[bender_cls] = handler
+            return handler
+        return decorator
+
+    def compile(self, mapping):
+        """Return a function bending sources with the mapping."""
+        bender = benderify(mapping)
+        handler = self.handlers.get(type(bender))
+        if handler is None:
+            return bender.bend
+        return handler(self, bender)
+
+    def bend(self, mapping, source):
+        return self.compile(mapping)(source)
+
+
+class ReferenceEngine(Engine):
+    """Evaluates benders with their bend() method."""
+
+
+class ClosureEngine(Engine):
+    """
+    Compiles bender trees into nested closures, saving the method lookups
+    and calls of the reference engine, e.g. `F(func)` becomes `func` itself
+    and constant values are captured instead of bent.
+    """
+
+
+@ClosureEngine.register(K)
+def _compile_k(engine, bender):
+    value = bender._val
+    return lambda source: value
+
+
+@ClosureEngine.register(S)
+def _compile_s(engine, bender):
+    path = bender._path
+    if len(path) == 1:
+        key, = path
+        return lambda source: source[key]
+
+    def select(source):
+        for key in path:
+            source = source[key]
+        return source
+    return select
+
+
+@ClosureEngine.register(GetItem)
+def _compile_getitem(engine, bender):
+    index = bender._index
+    return lambda source: source[index]
+
+
+@ClosureEngine.register(F)
+def _compile_f(engine, bender):
+    func, args, kwargs = bender._func, bender._args, bender._kwargs
+    if not (args or kwargs):
+        return func
+    return lambda value: func(value, *args, **kwargs)
+
+
+@ClosureEngine.register(Compose, Scope)
+def _compile_compose(engine, bender):
+    first = engine.compile(bender._first)
+    second = engine.compile(bender._second)
+
+    def compose(source):
+        value = first(source)
+        return OMIT if value is OMIT else second(value)
+    return compose
+
+
+@ClosureEngine.register(Neg, Invert)
+def _compile_unary(engine, bender):
+    op = bender.op
+    inner = engine.compile(bender.bender)
+    return lambda source: op(inner(source))
+
+
+@ClosureEngine.register(Add, Sub, Mul, Div, FloorDiv, Eq, Ne, Lt, Le, Gt, Ge,
+                        In, And, Or)
+def _compile_binary(engine, bender):
+    op = bender.op
+    b1, b2 = bender._bender1, bender._bender2
+    if type(b2) is K:
+        v2, f1 = b2._val, engine.compile(b1)
+        return lambda source: op(f1(source), v2)
+    if type(b1) is K:
+        v1, f2 = b1._val, engine.compile(b2)
+        return lambda source: op(v1, f2(source))
+    f1, f2 = engine.compile(b1), engine.compile(b2)
+    return lambda source: op(f1(source), f2(source))
+
+
+@ClosureEngine.register(Dict)
+def _compile_dict(engine, bender):
+    items = tuple((k, engine.compile(v)) for k, v in bender.dict.items())
+
+    def bend_dict(source):
+        res = {}
+        k = None
+        try:
+            for k, func in items:
+                value = func(source)
+                if value is not OMIT:
+                    res[k] = value
+        except Exception as e:
+            raise BendingException.wrap(k, e)
+        return res
+    return bend_dict
+
+
+@ClosureEngine.register(List)
+def _compile_list(engine, bender):
+    funcs = tuple(engine.compile(v) for v in bender.list)
+
+    def bend_list(source):
+        res = [func(source) for func in funcs]
+        return [v for v in res if v is not OMIT]
+    return bend_list
+
+
+@ClosureEngine.register(If)
+def _compile_if(engine, bender):
+    condition = engine.compile(bender.condition)
+    when_true = engine.compile(bender.when_true)
+    when_false = engine.compile(bender.when_false)
+    return lambda source: (when_true(source) if condition(source)
+                           else when_false(source))
+
+
+@ClosureEngine.register(ForallBend)
+def _compile_forall_bend(engine, bender):
+    func = engine.compile(bender._mapping)
+    return lambda source: list(map(func, source))
+
+
+def select_engine(mapping, samples, engines=None, repeat=3):
+    """
+    Time the engines on the sample sources and return the fastest engine
+    for the mapping, and the function it compiled.
+
+    engines: a list of Engine instances, defaults to all built-in engines.
+    """
+    engines = engines or [ReferenceEngine(), ClosureEngine()]
+    samples = list(samples)
+    best = None
+    for engine in engines:
+        func = engine.compile(mapping)
+        seconds = float('inf')
+        for _ in range(repeat):
+            start = perf_counter()
+            for sample in samples:
+                func(sample)
+            seconds = min(seconds, perf_counter() - start)
+        if best is None or seconds < best[0]:
+            best = (seconds, engine, func)
+    return best[1], best[2]
@@ -2,7 +2,7 @@ from functools import reduce
 from itertools import chain
 from warnings import warn
 
-from jsonbender.core import Bender, bend
+from jsonbender.core import Bender, benderify
 
 
 class ListOp(Bender):
@@ -64,13 +64,14 @@ class ForallBend(Forall):
 
     def __init__(self, mapping, context=None):
         self._mapping = mapping
+        # The mapping is turned into benders only once, not for each element.
+        self._func = benderify(mapping).bend
         # TODO this is here for retrocompatibility reasons.
         # remove this when ListOp also breaks retrocompatibility
         self._bender = None
 
-    def bend(self, source):
-        self._func = lambda v: bend(self._mapping, v)
-        return super().bend(source)
+
+_nothing = object()
 
 
 class Reduce(ListOp):
@@ -79,16 +80,27 @@ class Reduce(ListOp):
     Reduces an iterable into a single value by repeatedly applying the given
     function to the elements.
     The function must accept two parameters: the first is the accumulator (the
-    value returned from the last call), which defaults to the first element of
-    the iterable (it must be nonempty); the second is the next value from the
-    iterable.
+    value returned from the last call), which defaults to the `initial`
+    parameter or, if it's not given, to the first element of the iterable (it
+    must be nonempty then); the second is the next value from the iterable.
 
     Example: To sum a given list,
     ```
     Reduce(lambda acc, i: acc + i).bend([1, 4, 6])  # -> 11
+    Reduce(lambda acc, i: acc + i, initial=0).bend([])  # -> 0
     ```
     """
+    def __init__(self, *args, **kwargs):
+        self._initial = kwargs.pop('initial', _nothing)
+        if kwargs:
+            msg = ('{} got unexpected keyword arguments: {}'
+                   .format(type(self).__name__, ', '.join(kwargs)))
+            raise TypeError(msg)
+        super(Reduce, self).__init__(*args)
+
     def op(self, func, vals):
+        if self._initial is not _nothing:
+            return reduce(func, vals, self._initial)
         try:
             return reduce(func, vals)
         except TypeError as e:  # empty list with no initial value
@@ -126,3 +138,241 @@ class FlatForall(ListOp):
     """
     def op(self, func, vals):
         return list(chain.from_iterable(map(func, vals)))
+
+
+class Aggregate(ListOp):
+    """
+    Base class for the built-in aggregates.
+    Unlike the other list ops, the function is optional: if given, it's
+    applied to each element before aggregating. It may also be a bender,
+    in which case it is used to bend each element.
+    Subclasses should rely on builtins (sum(), min(), any() etc.) instead of
+    calling a Python function per element wherever possible.
+    """
+    def __init__(self, func=None):
+        if isinstance(func, Bender):
+            func = func.bend
+        self._func = func
+        # only there for ListOp.bend()
+        self._bender = None
+
+    def _values(self, func, vals):
+        return vals if func is None else map(func, vals)
+
+
+class Count(Aggregate):
+    """
+    Counts the elements of the iterable. If a function is given, counts only
+    the elements for which it returns True.
+
+    Example:
+    ```
+    Count().bend([1, 2, 3])  # -> 3
+    Count(lambda i: i > 1).bend([1, 2, 3])  # -> 2
+    ```
+    """
+    def op(self, func, vals):
+        if func is None:
+            try:
+                return len(vals)
+            except TypeError:  # not sized
+                return sum(1 for _ in vals)
+        return sum(1 for _ in filter(func, vals))
+
+
+class Sum(Aggregate):
+    """
+    Sums the elements of the iterable (or the values the given function
+    returns for them). Returns 0 for empty iterables.
+
+    Example:
+    ```
+    Sum(lambda d: d['price']).bend([{'price': 2}, {'price': 3}])  # -> 5
+    ```
+    """
+    def op(self, func, vals):
+        return sum(self._values(func, vals))
+
+
+class Min(Aggregate):
+    """
+    Returns the smallest element of the iterable (or the smallest of the
+    values the given function returns for them).
+    Raises ValueError for empty iterables.
+
+    Example:
+    ```
+    Min().bend([3, 1, 2])  # -> 1
+    ```
+    """
+    def op(self, func, vals):
+        return min(self._values(func, vals))
+
+
+class Max(Aggregate):
+    """
+    Returns the largest element of the iterable (or the largest of the
+    values the given function returns for them).
+    Raises ValueError for empty iterables.
+
+    Example:
+    ```
+    Max().bend([3, 1, 2])  # -> 3
+    ```
+    """
+    def op(self, func, vals):
+        return max(self._values(func, vals))
+
+
+class Any(Aggregate):
+    """
+    Returns True if any element of the iterable (or any value the given
+    function returns for them) is true. Stops at the first true value.
+
+    Example:
+    ```
+    Any(lambda i: i > 2).bend([1, 2, 3])  # -> True
+    ```
+    """
+    def op(self, func, vals):
+        return any(self._values(func, vals))
+
+
+class All(Aggregate):
+    """
+    Returns True if all elements of the iterable (or all values the given
+    function returns for them) are true. Stops at the first false value.
+
+    Example:
+    ```
+    All(lambda i: i > 2).bend([1, 2, 3])  # -> False
+    ```
+    """
+    def op(self, func, vals):
+        return all(self._values(func, vals))
+
+
+class Distinct(Aggregate):
+    """
+    Builds a new list with the elements of the iterable without duplicates,
+    keeping the first occurrence of each. If a function is given, elements
+    are considered duplicates when it returns the same value for them.
+    The elements (or function values) must be hashable.
+
+    Example:
+    ```
+    Distinct().bend([1, 2, 1, 3])  # -> [1, 2, 3]
+    Distinct(lambda d: d['id']).bend([{'id': 1, 'v': 'a'},
+                                      {'id': 1, 'v': 'b'}])
+    # -> [{'id': 1, 'v': 'a'}]
+    ```
+    """
+    def op(self, func, vals):
+        if func is None:
+            return list(dict.fromkeys(vals))
+        seen = set()
+        res = []
+        for v in vals:
+            key = func(v)
+            if key not in seen:
+                seen.add(key)
+                res.append(v)
+        return res
+
+
+class GroupBy(Aggregate):
+    """
+    Groups the elements of the iterable by the value the given function (or
+    bender) returns for them.
+    Returns a dict from each key to the list of its elements, in the order
+    they appear in the iterable.
+
+    Example:
+    ```
+    GroupBy(S('type')).bend([{'type': 'a', 'v': 1},
+                             {'type': 'b', 'v': 2},
+                             {'type': 'a', 'v': 3}])
+    # -> {'a': [{'type': 'a', 'v': 1}, {'type': 'a', 'v': 3}],
+    #     'b': [{'type': 'b', 'v': 2}]}
+    ```
+    """
+    def __init__(self, func):
+        super(GroupBy, self).__init__(func)
+
+    def op(self, func, vals):
+        res = {}
+        for v in vals:
+            key = func(v)
+            try:
+                res[key].append(v)
+            except KeyError:
+                res[key] = [v]
+        return res
+
+
+class IndexBy(Aggregate):
+    """
+    Builds a dict from the value the given function (or bender) returns for
+    each element of the iterable to the element itself.
+    If several elements have the same key, the last one wins.
+
+    Use it to build a hash index once and look up into it, instead of
+    searching a list for each element of another one.
+
+    Example:
+    ```
+    IndexBy(S('id')).bend([{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'b'}])
+    # -> {1: {'id': 1, 'v': 'a'}, 2: {'id': 2, 'v': 'b'}}
+    ```
+    """
+    def __init__(self, func):
+        super(IndexBy, self).__init__(func)
+
+    def op(self, func, vals):
+        return {func(v): v for v in vals}
+
+
+class Join(Bender):
+    """
+    Joins two lists from the source by key, like a SQL join.
+    Returns a list of `(left_element, right_element)` tuples in the order of
+    the left list.
+
+    `left` and `right` are benders selecting the lists.
+    `on` is the function (or bender) returning the key of an element; pass a
+    `(left_key, right_key)` tuple if the keys differ between both sides.
+    `how` is either 'inner' (the default), which drops left elements without
+    match, or 'left', which pairs them with None.
+
+    The right list is indexed once per bend, so joining is linear instead of
+    quadratic. If several right elements share a key, each left element is
+    paired with all of them.
+
+    Example:
+    ```
+    join = Join(S('line_items'), S('products'),
+                on=(S('product_id'), S('id')))
+    join.bend({'line_items': [{'product_id': 2, 'qty': 3}],
+               'products': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]})
+    # -> [({'product_id': 2, 'qty': 3}, {'id': 2, 'name': 'b'})]
+    ```
+    """
+    def __init__(self, left, right, on, how='inner'):
+        if how not in ('inner', 'left'):
+            raise ValueError('Unknown join type: {}'.format(how))
+        self._left = benderify(left)
+        self._right = benderify(right)
+        left_key, right_key = on if isinstance(on, tuple) else (on, on)
+        self._group_right = GroupBy(right_key)
+        self._left_key = (left_key.bend if isinstance(left_key, Bender)
+                          else left_key)
+        self._how = how
+
+    def bend(self, source):
+        index = self._group_right.bend(self._right.bend(source))
+        left_key = self._left_key
+        missing = [None] if self._how == 'left' else []
+        res = []
+        for item in self._left.bend(source):
+            res.extend((item, r) for r in index.get(left_key(item), missing))
+        return res
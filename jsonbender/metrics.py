@@ -0,0 +1,172 @@
+"""
+Runtime metrics for the bending entry points (`bend()`, `bend_columns()`
+etc.).
+
+A metrics hook is any object with a `record()` method:
+
+    record(entry_point, mapping, records, seconds, error=None)
+
+which is called after each call of an entry point with its name, the
+mapping, how many records were bent, how long it took and the exception
+raised (if any). Set it with `set_hook()`. When no hook is set, the entry
+points don't measure anything. The hook may be called from several threads
+at the same time (e.g. by `abend_stream()`).
+
+`Collector` is a ready-made hook which aggregates throughput, latency
+percentiles and errors, and exports them through a callback, so it can be
+attached to Prometheus, statsd etc.
+"""
+from collections import Counter
+from math import ceil
+from threading import Lock
+from time import perf_counter
+
+
+hook = None
+"""The current metrics hook. Use set_hook() to change it."""
+
+
+def set_hook(new_hook):
+    """Set the metrics hook (None to disable metrics). Returns the old one."""
+    global hook
+    old, hook = hook, new_hook
+    return old
+
+
+def observe(hook, entry_point, mapping, records, func, *args):
+    """Call `func(*args)` and report it to `hook`."""
+    start = perf_counter()
+    try:
+        res = func(*args)
+    except Exception as e:
+        hook.record(entry_point, mapping, records, perf_counter() - start, e)
+        raise
+    hook.record(entry_point, mapping, records, perf_counter() - start)
+    return res
+
+
+class Histogram(object):
+    """
+    HDR-style histogram: values are counted in buckets whose width grows
+    with the magnitude of the value, so that every recorded value is
+    represented with a bounded relative error while memory stays
+    logarithmic in the range of values.
+
+    Values are recorded as integers of `unit`, rounded up (seconds are
+    recorded in nanoseconds by default). `precision` is the number of
+    significant bits kept of each value: values below `2 ** precision` units
+    are exact, larger ones have a relative error below `2 ** (1 - precision)`
+    (below 1% with the default 8 bits).
+    """
+
+    def __init__(self, precision=8, unit=1e-9):
+        self.precision = precision
+        self.unit = unit
+        self.count = 0
+        self.max = 0
+        self._buckets = Counter()
+
+    def record(self, value):
+        v = int(ceil(value / self.unit))
+        shift = max(v.bit_length() - self.precision, 0)
+        self._buckets[(shift, v >> shift)] += 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, p):
+        """
+        Return the highest value equivalent to the one at percentile `p`
+        (0-100), or 0 if nothing was recorded.
+        """
+        if not self.count:
+            return 0
+        rank = max(int(ceil(p / 100.0 * self.count)), 1)
+        seen = 0
+        for shift, mantissa in sorted(self._buckets,
+                                      key=lambda b: b[1] << b[0]):
+            seen += self._buckets[(shift, mantissa)]
+            if seen >= rank:
+                highest = ((mantissa + 1) << shift) - 1
+                return min(highest * self.unit, self.max)
+        return self.max
+
+
+class _Stats(object):
+    def __init__(self):
+        self.calls = 0
+        self.records = 0
+        self.seconds = 0.0
+        self.latency = Histogram()
+        self.errors = Counter()
+
+
+class Collector(object):
+    """
+    A metrics hook aggregating, per entry point and mapping label:
+    the number of calls and records, the total time, a latency histogram
+    of the calls and the errors, counted by the (top-level) dict key
+    that failed (None when unknown).
+
+    `label` is an optional function which returns the label of a mapping,
+    e.g. `label=lambda m: MAPPING_NAMES[id(m)]`. By default all mappings
+    share the same label (None).
+    """
+
+    percentiles = (50, 90, 99, 99.9)
+
+    def __init__(self, label=None):
+        self._label = label
+        self._lock = Lock()
+        self.stats = {}
+
+    def record(self, entry_point, mapping, records, seconds, error=None):
+        label = self._label(mapping) if self._label else None
+        with self._lock:
+            try:
+                stats = self.stats[(entry_point, label)]
+            except KeyError:
+                stats = self.stats[(entry_point, label)] = _Stats()
+            stats.calls += 1
+            stats.records += records
+            stats.seconds += seconds
+            stats.latency.record(seconds)
+            if error is not None:
+                stats.errors[getattr(error, 'key', None)] += 1
+
+    def throughput(self, entry_point, label=None):
+        """Records per second spent bending."""
+        stats = self.stats[(entry_point, label)]
+        return stats.records / stats.seconds if stats.seconds else 0.0
+
+    def export(self, callback):
+        """
+        Call `callback(name, value, labels)` for each metric, where `labels`
+        is a dict. Metrics are:
+
+        - jsonbender_calls_total
+        - jsonbender_records_total
+        - jsonbender_seconds_total
+        - jsonbender_latency_seconds, with a `quantile` label
+        - jsonbender_errors_total, with a `key` label
+        """
+        # Snapshot under the lock, call back outside of it.
+        with self._lock:
+            snapshot = [
+                (entry_point, label, stats.calls, stats.records,
+                 stats.seconds,
+                 [stats.latency.percentile(p) for p in self.percentiles],
+                 dict(stats.errors))
+                for (entry_point, label), stats in self.stats.items()
+            ]
+        for (entry_point, label, calls, records, seconds, latencies,
+             errors) in snapshot:
+            labels = {'entry_point': entry_point, 'mapping': label}
+            callback('jsonbender_calls_total', calls, labels)
+            callback('jsonbender_records_total', records, labels)
+            callback('jsonbender_seconds_total', seconds, labels)
+            for p, latency in zip(self.percentiles, latencies):
+                callback('jsonbender_latency_seconds', latency,
+                         dict(labels, quantile=p / 100.0))
+            for key, count in errors.items():
+                callback('jsonbender_errors_total', count,
+                         dict(labels, key=key))
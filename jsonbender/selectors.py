@@ -1,4 +1,8 @@
-from jsonbender.core import Bender
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from jsonbender.core import Bender, MISSING, lookup
 
 
 class S(Bender):
@@ -17,6 +21,13 @@ class S(Bender):
             source = source[key]
         return source
 
+    def probe(self, source):
+        for key in self._path:
+            source = lookup(source, key)
+            if source is MISSING:
+                return MISSING
+        return source
+
     def optional(self, default=None):
         """
         Return an OptionalS with the same path and with the given `default`.
@@ -39,12 +50,10 @@ class OptionalS(S):
         super(OptionalS, self).__init__(*path)
 
     def bend(self, source):
-        try:
-            ret = super(OptionalS, self).bend(source)
-        except LookupError:
-            return self.default
-        else:
-            return ret
+        ret = super(OptionalS, self).probe(source)
+        return self.default if ret is MISSING else ret
+
+    probe = bend
 
 
 class F(Bender):
@@ -79,6 +88,15 @@ class F(Bender):
                           protect_against=protect_against,
                           **self._kwargs)
 
+    def cached(self, maxsize=128, ttl=None, cache=None):
+        """
+        Return a CachedF with the same parameters, caching the results in
+        `cache` or in a new LRUCache with the given `maxsize` and `ttl`.
+        """
+        if cache is None:
+            cache = LRUCache(maxsize, ttl)
+        return CachedF(self._func, *self._args, cache=cache, **self._kwargs)
+
 
 class ProtectedF(F):
     """
@@ -105,3 +123,96 @@ class ProtectedF(F):
             return super(ProtectedF, self).bend(value)
 
 
+class LRUCache(object):
+    """
+    A bounded cache which evicts the least recently used entries first.
+    Entries expire after `ttl` seconds, if given.
+    `hits` and `misses` count the lookups.
+
+    A single instance may be shared by several CachedF benders (and
+    mappings). It is thread-safe, e.g. for bending in the threads of
+    `abend_stream()`.
+    """
+    def __init__(self, maxsize=128, ttl=None):
+        if maxsize < 1:
+            raise ValueError('maxsize must be positive')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """Return the cached value for `key` or MISSING."""
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return MISSING
+            if expires is not None and expires < monotonic():
+                del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedF(F):
+    """
+    Similar to F, but caches the results of the function, so it should only
+    be used for pure functions.
+    The cache key is made of the function, the passed value (and its type)
+    and the extra parameters, which must be hashable. Unhashable values are
+    passed to the function without caching.
+
+    `cache` is the cache to use (see LRUCache), which may be shared by
+    several benders. Otherwise a new LRUCache is created with `maxsize`
+    (defaults to 128) and `ttl` (seconds, defaults to None: no expiry).
+
+    Example:
+    ```
+    parse = CachedF(datetime.strptime, '%Y-%m-%d', maxsize=1024)
+    parse.bend('2019-01-01')  # -> datetime(2019, 1, 1)
+    ```
+    """
+    def __init__(self, func, *args, **kwargs):
+        cache = kwargs.pop('cache', None)
+        maxsize = kwargs.pop('maxsize', 128)
+        ttl = kwargs.pop('ttl', None)
+        super(CachedF, self).__init__(func, *args, **kwargs)
+        self.cache = LRUCache(maxsize, ttl) if cache is None else cache
+        self._key = (func, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(self._key)
+        except TypeError:
+            raise TypeError('The parameters of CachedF must be hashable')
+
+    def bend(self, value):
+        key = (self._key, type(value), value)
+        try:
+            ret = self.cache.get(key)
+        except TypeError:  # unhashable value
+            return super(CachedF, self).bend(value)
+        if ret is MISSING:
+            ret = super(CachedF, self).bend(value)
+            self.cache.set(key, ret)
+        return ret
@@ -0,0 +1,120 @@
+import asyncio
+from collections import deque
+
+from jsonbender import metrics
+from jsonbender.core import benderify
+
+
+def _bend_all(bender, batch):
+    return [bender.bend(source) for source in batch]
+
+
+def _bend_batch(mapping, bender, batch):
+    hook = metrics.hook
+    if hook is None:
+        return _bend_all(bender, batch)
+    return metrics.observe(hook, 'abend_stream', mapping, len(batch),
+                           _bend_all, bender, batch)
+
+
+async def abend_stream(mapping, sources, batch_size=100, max_in_flight=4,
+                       ordered=True, executor=None, max_delay=0.1):
+    """
+    Bend the sources of an async iterable (a message queue consumer etc.)
+    and asynchronously yield the results.
+
+    The sources are bent in batches of `batch_size` in `executor` (defaults
+    to the event loop's default executor), so bending doesn't block the
+    event loop. A batch is also bent once `max_delay` seconds have passed
+    since its first source was read (None to wait for full batches), so the
+    sources of an idle queue aren't held back. At most `max_in_flight`
+    batches are bent at the same time; while they are, no more sources are
+    read, so a slow consumer slows down reading instead of making memory
+    grow.
+
+    The results of each batch are yielded as soon as it's done (with
+    `ordered`, the default, once the batches before it are done too, so the
+    results are in the order of the sources), even while waiting for the
+    next source. With a process pool executor, the mapping must be
+    picklable. The metrics hook (see `metrics`) is called from the
+    executor's threads.
+
+    Example:
+    ```
+    async for out in abend_stream(MAPPING, consumer, batch_size=500):
+        await producer.send(out)
+    ```
+    """
+    if batch_size < 1 or max_in_flight < 1:
+        raise ValueError('batch_size and max_in_flight must be positive')
+    bender = benderify(mapping)
+    loop = asyncio.get_running_loop()
+    sources = sources.__aiter__()
+    pending = deque() if ordered else set()
+
+    def submit(batch):
+        future = loop.run_in_executor(executor, _bend_batch, mapping, bender,
+                                      batch)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+
+    def ready_batches():
+        if ordered:
+            done = []
+            while pending and pending[0].done():
+                done.append(pending.popleft().result())
+            return done
+        done = [future for future in pending if future.done()]
+        pending.difference_update(done)
+        return [future.result() for future in done]
+
+    reader = None  # the task reading the next source
+    batch = []
+    deadline = None
+    exhausted = False
+    try:
+        while True:
+            for results in ready_batches():
+                for res in results:
+                    yield res
+            if exhausted and not (batch or pending):
+                break
+            can_submit = len(pending) < max_in_flight
+            if batch and can_submit and (
+                    exhausted or len(batch) >= batch_size or
+                    (deadline is not None and loop.time() >= deadline)):
+                submit(batch)
+                batch = []
+                continue
+            # wake up when a batch can be yielded, a source was read or
+            # the batch is due
+            if ordered:
+                waits = {pending[0]} if pending else set()
+            else:
+                waits = set(pending)
+            timeout = None
+            if not exhausted and can_submit:
+                if reader is None:
+                    reader = asyncio.ensure_future(sources.__anext__())
+                waits.add(reader)
+                if batch and deadline is not None:
+                    timeout = max(deadline - loop.time(), 0)
+            done, _ = await asyncio.wait(waits, timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if reader in done:
+                task, reader = reader, None
+                try:
+                    source = task.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    if not batch and max_delay is not None:
+                        deadline = loop.time() + max_delay
+                    batch.append(source)
+    finally:
+        if reader is not None:
+            reader.cancel()
+        for future in pending:
+            future.cancel()
@@ -1,5 +1,64 @@
+from time import perf_counter
+
+
 class BenderTestMixin(object):
     def assert_bender(self, bender, source, expected_value, msg=None):
         got = bender.bend(source)
         assert got == expected_value
 
+
+def outcome(func, *args):
+    """
+    Call func(*args) and return `('value', result)` or, if it raises,
+    `('error', exception_type)`.
+    """
+    try:
+        return 'value', func(*args)
+    except Exception as e:
+        return 'error', type(e)
+
+
+def same_outcome(expected, got):
+    if expected[0] != got[0]:
+        return False
+    # repr() also matches equal-looking values which don't compare equal,
+    # like NaNs.
+    return expected[1] == got[1] or repr(expected[1]) == repr(got[1])
+
+
+class EngineComparison(object):
+    """
+    Checks that evaluation engines give the same results (or raise the same
+    exception types) as the reference interpreter, `Bender.bend()`, and
+    records their speed relative to it.
+
+    `engines` is a dict from names to functions taking a bender and a
+    source, and returning the bent value.
+    """
+
+    def __init__(self, engines):
+        self.engines = engines
+        self.seconds = dict.fromkeys(engines, 0.0)
+        self.seconds['reference'] = 0.0
+
+    def _run(self, name, func, *args):
+        start = perf_counter()
+        res = outcome(func, *args)
+        self.seconds[name] += perf_counter() - start
+        return res
+
+    def check(self, bender, source):
+        expected = self._run('reference', bender.bend, source)
+        for name, engine in self.engines.items():
+            got = self._run(name, engine, bender, source)
+            assert same_outcome(expected, got), (
+                '{} gave {!r} instead of {!r}'.format(name, got, expected))
+
+    def relative_speed(self):
+        """
+        Return a dict from each engine name to its total time divided by the
+        reference's.
+        """
+        ref = self.seconds['reference'] or float('nan')
+        return {name: seconds / ref for name, seconds in self.seconds.items()
+                if name != 'reference'}
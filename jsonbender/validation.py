@@ -0,0 +1,124 @@
+from collections import Counter, OrderedDict
+from time import perf_counter
+
+from jsonbender.core import OMIT, Dict, benderify
+
+
+class KeyReport(object):
+    """
+    What `check()` found out about one key of a mapping.
+
+    path: the tuple of keys leading to it
+    types: a Counter of the names of the types bent for it
+    errors: a list of `(sample_index, exception)` tuples
+    seconds: the total time spent bending it
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.types = Counter()
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def nullable(self):
+        return 'NoneType' in self.types
+
+    @property
+    def consistent(self):
+        """Whether all non-null values had the same type."""
+        return len(set(self.types) - {'NoneType'}) <= 1
+
+    def __repr__(self):
+        return ('<KeyReport {} types={} errors={} seconds={:.6f}>'
+                .format(self.path, dict(self.types), len(self.errors),
+                        self.seconds))
+
+
+class CheckReport(object):
+    """
+    Result of `check()`. `keys` is an OrderedDict from each (leaf) key path
+    of the mapping to its KeyReport.
+    """
+
+    def __init__(self, samples):
+        self.samples = samples
+        self.keys = OrderedDict()
+
+    @property
+    def failures(self):
+        """The reports of the keys that failed for some sample."""
+        return [r for r in self.keys.values() if r.errors]
+
+    @property
+    def inconsistent(self):
+        """The reports of the keys that returned values of several types."""
+        return [r for r in self.keys.values() if not r.consistent]
+
+    @property
+    def ok(self):
+        return not (self.failures or self.inconsistent)
+
+    @property
+    def schema(self):
+        """
+        The inferred output schema: a dict from each key path to the sorted
+        names of the types bent for it.
+        """
+        return {path: sorted(r.types) for path, r in self.keys.items()}
+
+    def __str__(self):
+        lines = []
+        for path, r in self.keys.items():
+            status = ('FAIL' if r.errors else
+                      'INCONSISTENT' if not r.consistent else 'ok')
+            lines.append('{} {}: {} ({:.1f}us/sample)'.format(
+                status, '.'.join(map(str, path)),
+                '|'.join(sorted(r.types)) or '-',
+                r.seconds / max(self.samples, 1) * 1e6))
+            for i, e in r.errors[:3]:
+                lines.append('    sample {}: {!r}'.format(i, e))
+        return '\n'.join(lines)
+
+
+def _leaves(bender, path=()):
+    if isinstance(bender, Dict):
+        for k, v in bender.dict.items():
+            for leaf in _leaves(v, path + (k,)):
+                yield leaf
+    else:
+        yield path, bender
+
+
+def check(mapping, samples):
+    """
+    Bend a set of sample sources with each (leaf) key of the mapping
+    separately, to find mapping errors before bending in production.
+
+    mapping: the map of benders, as passed to `bend()`
+    samples: an iterable of sample sources
+
+    returns a CheckReport with the types each key returned, the samples for
+    which it failed and the time spent on it.
+
+    Example:
+    ```
+    report = check({'total': S('price') * S('qty')}, samples)
+    assert report.ok, str(report)
+    ```
+    """
+    samples = list(samples)
+    report = CheckReport(len(samples))
+    for path, bender in _leaves(benderify(mapping)):
+        key_report = report.keys[path] = KeyReport(path)
+        for i, sample in enumerate(samples):
+            start = perf_counter()
+            try:
+                value = bender.bend(sample)
+            except Exception as e:
+                key_report.errors.append((i, e))
+            else:
+                if value is not OMIT:
+                    key_report.types[type(value).__name__] += 1
+            key_report.seconds += perf_counter() - start
+    return report
@@ -0,0 +1,249 @@
+from array import array
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pytest
+
+from jsonbender import K, F, S, OptionalS, bend
+from jsonbender.batch import (Record, bend_columns, bend_file, bend_many,
+                              _split_lines)
+from jsonbender.control_flow import OmitIfMissing
+from jsonbender.core import BendingException
+
+
+def upper(name):
+    return name.upper()
+
+
+class TestBendColumns(unittest.TestCase):
+    def setUp(self):
+        self.sources = [{'id': 1, 'price': 2.5, 'name': 'a'},
+                        {'id': 2, 'name': 'b'},
+                        {'id': 3, 'price': 1.0, 'name': 'c'}]
+        self.mapping = {'id': S('id'),
+                        'price': OptionalS('price'),
+                        'name': S('name'),
+                        'const': K(0)}
+
+    def test_untyped_columns(self):
+        got = bend_columns(self.mapping, self.sources)
+        self.assertEqual(got, {'id': [1, 2, 3],
+                               'price': [2.5, None, 1.0],
+                               'name': ['a', 'b', 'c'],
+                               'const': [0, 0, 0]})
+        self.assertEqual(got.nulls, {})
+
+    def test_typed_columns(self):
+        got = bend_columns(self.mapping, iter(self.sources),
+                           types={'id': 'q', 'price': 'd'})
+        self.assertEqual(got['id'], array('q', [1, 2, 3]))
+        self.assertIsInstance(got['price'], array)
+        self.assertEqual(got['price'][0], 2.5)
+        self.assertTrue(math.isnan(got['price'][1]))
+        self.assertEqual(got.nulls, {'price': bytearray([1, 0, 1])})
+
+    def test_empty_sources(self):
+        got = bend_columns(self.mapping, [], types={'id': 'q'})
+        self.assertEqual(got['id'], array('q'))
+        self.assertEqual(got['name'], [])
+
+    def test_error(self):
+        with self.assertRaises(BendingException):
+            bend_columns({'x': S('missing')}, self.sources)
+
+    def test_value_not_fitting_the_type(self):
+        for value in ['a', 2 ** 64]:
+            with self.assertRaises(BendingException) as ctx:
+                bend_columns({'id': K(value)}, self.sources, types={'id': 'q'})
+            self.assertEqual(ctx.exception.key, 'id')
+
+    def test_numpy_backend(self):
+        numpy = pytest.importorskip('numpy')
+        got = bend_columns(self.mapping, self.sources,
+                           types={'id': 'q', 'price': 'd'}, backend='numpy')
+        self.assertIsInstance(got['id'], numpy.ndarray)
+        self.assertEqual(got['id'].dtype, numpy.dtype('q'))
+        self.assertEqual(got['id'].tolist(), [1, 2, 3])
+        self.assertIsInstance(got['price'], numpy.ma.MaskedArray)
+        self.assertEqual(got['price'].tolist(), [2.5, None, 1.0])
+        self.assertEqual(got['name'], ['a', 'b', 'c'])
+        self.assertEqual(got.nulls, {})
+
+    def test_pyarrow_backend(self):
+        pyarrow = pytest.importorskip('pyarrow')
+        got = bend_columns(self.mapping, self.sources,
+                           types={'id': pyarrow.int64(),
+                                  'price': pyarrow.float64()},
+                           backend='pyarrow')
+        self.assertEqual(got['id'].type, pyarrow.int64())
+        self.assertEqual(got['id'].to_pylist(), [1, 2, 3])
+        self.assertEqual(got['price'].to_pylist(), [2.5, None, 1.0])
+        self.assertEqual(got['price'].null_count, 1)
+        self.assertEqual(got['name'], ['a', 'b', 'c'])
+
+    def test_non_dict_mapping(self):
+        self.assertRaises(ValueError, bend_columns, S('id'), self.sources)
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, bend_columns, self.mapping,
+                          self.sources, backend='nope')
+
+
+class TestBendMany(unittest.TestCase):
+    def setUp(self):
+        self.sources = [{'id': 1, 'name': 'a', 'city': 'x'},
+                        {'id': 2, 'name': 'b', 'city': 'y'}]
+        self.mapping = {'id': S('id'),
+                        'name': S('name'),
+                        'address': {'city': S('city')}}
+        self.expected = [{'id': 1, 'name': 'a', 'address': {'city': 'x'}},
+                         {'id': 2, 'name': 'b', 'address': {'city': 'y'}}]
+
+    def test_dicts(self):
+        self.assertEqual(bend_many(self.mapping, iter(self.sources)),
+                         self.expected)
+
+    def test_records(self):
+        for output in ('tuple', 'slots', 'dataclass'):
+            got = bend_many(self.mapping, self.sources, output=output)
+            self.assertEqual([r.to_dict() for r in got], self.expected)
+            first = got[0]
+            self.assertIsInstance(first, Record)
+            self.assertIsInstance(first.address, Record)
+            self.assertEqual((first.id, first.name, first.address.city),
+                             (1, 'a', 'x'))
+            self.assertEqual(first._fields, ('id', 'name', 'address'))
+            self.assertIs(type(got[1]), type(first))
+            self.assertEqual(got[0], got[0])
+            self.assertNotEqual(got[0], got[1])
+
+    def test_omitted_values_are_none(self):
+        mapping = {'id': S('id'), 'email': OmitIfMissing(S('email'))}
+        got = bend_many(mapping, [{'id': 1}], output='tuple')
+        self.assertEqual(got[0].to_dict(), {'id': 1, 'email': None})
+        cols = bend_columns(mapping, [{'id': 1}, {'id': 2, 'email': 'e'}])
+        self.assertEqual(cols['email'], [None, 'e'])
+
+    def test_slots_records_have_no_dict(self):
+        got = bend_many(self.mapping, self.sources, output='slots')
+        self.assertFalse(hasattr(got[0], '__dict__'))
+        self.assertIn("id=1", repr(got[0]))
+
+    @unittest.skipIf(sys.version_info < (3, 10), 'needs dataclass slots')
+    def test_dataclass_records_have_no_dict(self):
+        got = bend_many(self.mapping, self.sources, output='dataclass')
+        self.assertFalse(hasattr(got[0], '__dict__'))
+        self.assertFalse(hasattr(got[0].address, '__dict__'))
+        self.assertEqual(got[0].to_dict(), bend(self.mapping,
+                                                self.sources[0]))
+
+    def test_error(self):
+        with self.assertRaises(BendingException) as ctx:
+            bend_many(self.mapping, [{'id': 1, 'name': 'a'}], output='tuple')
+        self.assertEqual(ctx.exception.key, 'address')
+
+    def test_invalid_field_names(self):
+        self.assertRaises(ValueError, bend_many, {'a b': K(1)}, [{}],
+                          output='tuple')
+        self.assertRaises(ValueError, bend_many, {'class': K(1)}, [{}],
+                          output='slots')
+        self.assertRaises(ValueError, bend_many, {1: K(1)}, [{}],
+                          output='slots')
+
+    def test_reserved_field_names(self):
+        for output in ('tuple', 'slots', 'dataclass'):
+            for name in ('to_dict', '_fields'):
+                with self.assertRaisesRegex(ValueError, 'reserved'):
+                    bend_many({name: K(1)}, [{}], output=output)
+        with self.assertRaisesRegex(ValueError, 'underscore'):
+            bend_many({'_x': K(1)}, [{}], output='tuple')
+        self.assertEqual(bend_many({'_x': K(1)}, [{}], output='slots')[0]._x,
+                         1)
+
+    def test_invalid_output(self):
+        self.assertRaises(ValueError, bend_many, self.mapping, [],
+                          output='nope')
+        self.assertRaises(ValueError, bend_many, S('id'), [],
+                          output='tuple')
+
+
+class TestBendFile(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.in_path = os.path.join(self.dir, 'in.jsonl')
+        self.out_path = os.path.join(self.dir, 'out.jsonl')
+        self.sources = [{'id': i, 'name': 'n{}'.format(i)} for i in range(500)]
+        with open(self.in_path, 'w') as f:
+            for source in self.sources:
+                f.write(json.dumps(source) + '\n')
+        self.mapping = {'id': S('id'), 'upper': S('name') >> F(upper)}
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def read_output(self):
+        with open(self.out_path) as f:
+            return [json.loads(line) for line in f]
+
+    def expected(self):
+        return [bend(self.mapping, source) for source in self.sources]
+
+    def test_split_lines(self):
+        with open(self.in_path, 'rb') as f:
+            data = f.read()
+        ranges = _split_lines(self.in_path, 7)
+        self.assertEqual(len(ranges), 7)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[end - 1:end], b'\n')
+
+    def test_single_worker(self):
+        count = bend_file(self.mapping, self.in_path, self.out_path, workers=1)
+        self.assertEqual(count, 500)
+        self.assertEqual(self.read_output(), self.expected())
+
+    def test_many_workers(self):
+        count = bend_file(self.mapping, self.in_path, self.out_path, workers=3)
+        self.assertEqual(count, 500)
+        self.assertEqual(self.read_output(), self.expected())
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ['in.jsonl', 'out.jsonl'])
+
+    def test_spawned_workers(self):
+        count = bend_file(self.mapping, self.in_path, self.out_path,
+                          workers=2, start_method='spawn')
+        self.assertEqual(count, 500)
+        self.assertEqual(self.read_output(), self.expected())
+
+    def test_no_trailing_newline_and_blank_lines(self):
+        with open(self.in_path, 'w') as f:
+            f.write('{"id": 1, "name": "a"}\n\n{"id": 2, "name": "b"}')
+        count = bend_file(self.mapping, self.in_path, self.out_path, workers=2)
+        self.assertEqual(count, 2)
+        self.assertEqual(self.read_output(), [{'id': 1, 'upper': 'A'},
+                                              {'id': 2, 'upper': 'B'}])
+
+    def test_empty_file(self):
+        open(self.in_path, 'w').close()
+        self.assertEqual(bend_file(self.mapping, self.in_path, self.out_path),
+                         0)
+        self.assertEqual(self.read_output(), [])
+
+    def test_error(self):
+        with open(self.in_path, 'a') as f:
+            f.write('{"name": "no id"}\n')
+        for workers in (1, 2):
+            self.assertRaises(BendingException, bend_file, self.mapping,
+                              self.in_path, self.out_path, workers=workers)
+            self.assertEqual(sorted(os.listdir(self.dir)), ['in.jsonl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 from operator import add
+from types import MappingProxyType
 import unittest
 
-from jsonbender import K, S, bend
-from jsonbender.control_flow import If, Alternation, Switch
+from jsonbender import K, S, F, bend
+from jsonbender.core import MISSING, OMIT, Omit
+from jsonbender.control_flow import (If, Alternation, Switch, When,
+                                     OmitIfMissing)
 from jsonbender.test import BenderTestMixin
 
 
@@ -31,6 +34,13 @@ class TestIf(BenderTestMixin, unittest.TestCase):
         if_ = If(S('country') == K('China'), S('first_name'))
         self.assert_bender(if_, self.guga, None)
 
+    def test_probe(self):
+        if_ = If(S('is_business'), S('company'), K(None))
+        self.assertIs(if_.probe({}), MISSING)
+        self.assertIs(if_.probe({'is_business': True}), MISSING)
+        self.assertEqual(if_.probe({'is_business': True, 'company': 'X'}),
+                         'X')
+
 
 class TestAlternation(BenderTestMixin, unittest.TestCase):
     def test_empty_benders(self):
@@ -46,6 +56,35 @@ class TestAlternation(BenderTestMixin, unittest.TestCase):
         self.assertRaises(IndexError, Alternation(S(1)).bend, [])
         self.assertRaises(KeyError, Alternation(S(1)).bend, {})
 
+    def test_no_match_reraises_last_exception(self):
+        self.assertRaises(IndexError, Alternation(S('b'), S('a', 0)).bend,
+                          {'a': []})
+
+    def test_other_exceptions_propagate(self):
+        self.assertRaises(TypeError, Alternation(S('a'), S(0)).bend, None)
+
+    def test_custom_benders(self):
+        bender = Alternation(F(lambda d: d['x']), S('y'))
+        self.assert_bender(bender, {'y': 1}, 1)
+        self.assert_bender(bender, {'x': 2}, 2)
+
+    def test_benders_called_once(self):
+        calls = []
+
+        def last(source):
+            calls.append(source)
+            return source['y']
+
+        self.assert_bender(Alternation(S('x'), F(last)), {'y': 1}, 1)
+        self.assertRaises(KeyError, Alternation(S('x'), F(last)).bend, {})
+        self.assertEqual(calls, [{'y': 1}, {}])
+
+    def test_probe(self):
+        bender = Alternation(S(1), S(0))
+        self.assertEqual(bender.probe(['a']), 'a')
+        self.assertIs(bender.probe([]), MISSING)
+        self.assertRaises(ValueError, Alternation().probe, [])
+
 
 class TestSwitch(BenderTestMixin, unittest.TestCase):
     def test_match(self):
@@ -76,6 +115,59 @@ class TestSwitch(BenderTestMixin, unittest.TestCase):
     def test__no_match_without_default(self):
         self.assertRaises(KeyError, Switch(S('key'), {}).bend, {'key': None})
 
+    def test__no_match_list_cases(self):
+        self.assertRaises(IndexError, Switch(S('key'), []).bend, {'key': 0})
+        self.assert_bender(Switch(S('key'), [K(1)]), {'key': 0}, 1)
+
+    def test_probe(self):
+        bender = Switch(S('service'), {'twitter': S('handle')})
+        self.assertEqual(bender.probe({'service': 'twitter', 'handle': 'x'}),
+                         'x')
+        self.assertIs(bender.probe({'service': 'twitter'}), MISSING)
+        self.assertIs(bender.probe({'service': 'facebook'}), MISSING)
+        self.assertIs(bender.probe({}), MISSING)
+
+
+class TestOmit(BenderTestMixin, unittest.TestCase):
+    def test_when(self):
+        calls = []
+        mapping = {'name': S('name'),
+                   'company': When(S('is_business'),
+                                   {'name': S('company') >> F(calls.append)})}
+        self.assertEqual(bend(mapping, {'name': 'Li', 'is_business': False}),
+                         {'name': 'Li'})
+        self.assertEqual(calls, [])
+        self.assertEqual(bend(mapping, {'name': 'Li', 'is_business': True,
+                                        'company': 'X'}),
+                         {'name': 'Li', 'company': {'name': None}})
+        self.assertEqual(calls, ['X'])
+
+    def test_omit_if_missing(self):
+        mapping = {'name': S('name'), 'email': OmitIfMissing(S('email'))}
+        self.assertEqual(bend(mapping, {'name': 'Li'}), {'name': 'Li'})
+        self.assertEqual(bend(mapping, {'name': 'Li', 'email': 'e'}),
+                         {'name': 'Li', 'email': 'e'})
+        self.assert_bender(OmitIfMissing(S('a')), {}, OMIT)
+
+    def test_control_flow_propagates_omit(self):
+        mapping = {'a': If(S('a'), K(1), Omit()),
+                   'b': Switch(S('b'), {1: K(1)}, default=Omit()),
+                   'c': Alternation(S('c'), Omit()),
+                   'd': S('d') >> If(F(bool), K(1), Omit())}
+        self.assertEqual(bend(mapping, {'a': 0, 'b': 0, 'd': 0}), {})
+        self.assertEqual(bend(mapping, {'a': 1, 'b': 1, 'c': 1, 'd': 1}),
+                         {'a': 1, 'b': 1, 'c': 1, 'd': 1})
+
+    def test_omit_from_any_bender(self):
+        mapping = {'a': F(lambda s: OMIT), 'b': 1,
+                   'c': OmitIfMissing(S('x')) >> F(str),
+                   'd': [Omit(), 1, When(K(False), K(2))]}
+        self.assertEqual(bend(mapping, {}), {'b': 1, 'd': [1]})
+
+    def test_switch_accepts_any_mapping(self):
+        bender = Switch(S('k'), MappingProxyType({'a': K(1)}))
+        self.assert_bender(bender, {'k': 'a'}, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,9 +1,12 @@
 import unittest
 
+import copy
+import pickle
 import sys
 
 from jsonbender import S, K, F
-from jsonbender.core import bend, BendingException
+from jsonbender.core import (MISSING, Compose, Dict, Merge, Scope, bend,
+                             BendingException)
 from jsonbender.test import BenderTestMixin
 
 
@@ -72,6 +75,31 @@ class TestBend(unittest.TestCase):
         source = {}
         self.assertRaises(BendingException, bend, mapping, source)
 
+    def test_bending_exception_path(self):
+        mapping = {'a': {'b': {'c': S('x', 'y')}}}
+        with self.assertRaises(BendingException) as ctx:
+            bend(mapping, {'x': {}})
+        e = ctx.exception
+        self.assertEqual(e.path, ('a', 'b', 'c'))
+        self.assertEqual(e.key, 'a')
+        self.assertIsInstance(e.__cause__, KeyError)
+        self.assertEqual(str(e), "Error for key a: Error for key b: "
+                                 "Error for key c: 'y'")
+
+    def test_bending_exception_message(self):
+        e = BendingException('bad')
+        self.assertEqual(str(e), 'bad')
+        self.assertIsNone(e.key)
+        e = BendingException.wrap('k', e)
+        self.assertEqual(str(e), 'Error for key k: bad')
+
+    def test_bending_exception_pickle(self):
+        with self.assertRaises(BendingException) as ctx:
+            bend({'a': {'b': S('x')}}, {})
+        e = pickle.loads(pickle.dumps(ctx.exception))
+        self.assertEqual(e.path, ('a', 'b'))
+        self.assertEqual(str(e), str(ctx.exception))
+
     def test_constants_without_K(self):
         mapping = {'a': 'a const value', 'b': 123}
         self.assertDictEqual(bend(mapping, {}),
@@ -91,6 +119,38 @@ class TestOperators(unittest.TestCase, BenderTestMixin):
     def test_div(self):
         self.assert_bender(K(4) / K(2), None, 2)
         self.assertAlmostEqual((K(5) / K(2)).bend(None), 2.5, 2)
+        self.assert_bender(S('x') / 2, {'x': '5'}, 2.5)
+
+    def test_floordiv(self):
+        self.assert_bender(K(5) // K(2), None, 2)
+        self.assert_bender(K(-5) // K(2), None, -3)
+        self.assertIs(type((K(5) // K(2)).bend(None)), int)
+        self.assert_bender(K(5.5) // K(2), None, 2.0)
+
+    def test_constant_operands(self):
+        self.assert_bender(S('x') * 100, {'x': 2}, 200)
+        self.assert_bender(K(100) - S('x'), {'x': 2}, 98)
+        self.assert_bender(S('x') - S('y'), {'x': 2, 'y': 3}, -1)
+
+    def test_copy(self):
+        bender = S('x') * 100
+        clone = copy.copy(bender)
+        clone._bender1 = S('y')
+        self.assert_bender(clone, {'x': 1, 'y': 2}, 200)
+        self.assert_bender(bender, {'x': 1, 'y': 2}, 100)
+
+    def test_comparisons(self):
+        for a, b in [(1, 2), (2, 2), (3, 2)]:
+            self.assert_bender(K(a) < K(b), None, a < b)
+            self.assert_bender(K(a) <= K(b), None, a <= b)
+            self.assert_bender(K(a) > K(b), None, a > b)
+            self.assert_bender(K(a) >= K(b), None, a >= b)
+        self.assert_bender(S('x') > 1, {'x': 2}, True)
+        self.assert_bender(1 > S('x'), {'x': 2}, False)
+
+    def test_isin(self):
+        self.assert_bender(S('x').isin(['a', 'b']), {'x': 'a'}, True)
+        self.assert_bender(S('x').isin(S('y')), {'x': 'c', 'y': 'ab'}, False)
 
     def test_neg(self):
         self.assert_bender(-K(1), None, -1)
@@ -130,14 +190,72 @@ class TestGetItem(unittest.TestCase, BenderTestMixin):
             val = list(range(10))
         self.assert_bender(bender, {'val': val}, [2, 4, 6])
 
+    def test_probe(self):
+        self.assertEqual(S('val')[1].probe({'val': [1, 2]}), 2)
+        self.assertIs(S('val')[2].probe({'val': [1, 2]}), MISSING)
+        self.assertIs(S('val')[2].probe({}), MISSING)
+        self.assertIs(F(lambda v: v['x']).probe({}), MISSING)
+
 
 class TestDict(unittest.TestCase, BenderTestMixin):
+    def test_keys_order(self):
+        b = Dict({'b': K(1), 'a': K(2), 'c': S('c')})
+        self.assertEqual(b.keys, ('b', 'a', 'c'))
+        self.assertEqual(list(b.bend({'c': 3})), ['b', 'a', 'c'])
+
+    def test_bend_values(self):
+        b = Dict({'b': K(1), 'a': S('a')})
+        self.assertEqual(b.bend_values({'a': 2}), [1, 2])
+
+    def test_error_key(self):
+        b = Dict({'a': K(1), 'b': S('b'), 'c': K(3)})
+        for method in (b.bend, b.bend_values):
+            with self.assertRaises(BendingException) as ctx:
+                method({})
+            self.assertEqual(ctx.exception.key, 'b')
+            self.assertEqual(str(ctx.exception), "Error for key b: 'b'")
+
     def test_function_with_dict(self):
         filter_none = F(lambda d: {k: v for k, v in d.items() if v is not None})
         b = filter_none << {'a': K(1), 'b': K(None), 'c': False}
         self.assert_bender(b, {}, {'a': 1, 'c': False})
 
 
+class TestMerge(unittest.TestCase, BenderTestMixin):
+    def test_overlay(self):
+        b = Merge(S('payload'), {'id': S('payload', 'id') >> F(int)})
+        source = {'payload': {'id': '1', 'name': 'x'}}
+        self.assert_bender(b, source, {'id': 1, 'name': 'x'})
+        self.assertEqual(source, {'payload': {'id': '1', 'name': 'x'}})
+
+    def test_values_are_shared(self):
+        nested = {'deep': [1, 2]}
+        got = Merge(S('payload'), {'a': 1}).bend({'payload': {'n': nested}})
+        self.assertIs(got['n'], nested)
+
+    def test_merge_order(self):
+        b = Merge(K({'a': 1, 'b': 1}), K({'b': 2, 'c': 2}), {'c': 3})
+        self.assert_bender(b, {}, {'a': 1, 'b': 2, 'c': 3})
+
+    def test_no_benders(self):
+        self.assertRaises(ValueError, Merge)
+
+
+class TestScope(unittest.TestCase, BenderTestMixin):
+    def test_scope(self):
+        address = {'city': S('city'), 'zip': S('postal_code')}
+        b = Scope(S('addresses', 'home'), address)
+        source = {'addresses': {'home': {'city': 'Vienna',
+                                         'postal_code': '1010'}}}
+        self.assert_bender(b, source, {'city': 'Vienna', 'zip': '1010'})
+
+    def test_mapping_is_prepared_once(self):
+        b = Scope(S('a'), {'b': S('b')})
+        self.assertIsInstance(b, Compose)
+        self.assertEqual(bend({'x': b}, {'a': {'b': 1}}), {'x': {'b': 1}})
+        self.assertRaises(BendingException, bend, {'x': b}, {'a': {}})
+
+
 class TestList(unittest.TestCase, BenderTestMixin):
     def test_function_with_list(self):
         filter_none = F(lambda l: [v for v in l if v is not None])
@@ -0,0 +1,203 @@
+"""
+Differential tests: random bender trees, built from all the bender classes,
+are bent with random JSON sources by every evaluation engine, which must
+agree with the reference interpreter (`Bender.bend()`).
+"""
+import asyncio
+import operator
+import sys
+import unittest
+
+import pytest
+
+from jsonbender.batch import bend_many
+from jsonbender.engine import ClosureEngine
+from jsonbender.control_flow import (Alternation, If, OmitIfMissing, Switch,
+                                     When)
+from jsonbender.core import (Add, And, Compose, Dict, Div, Eq, FloorDiv, Ge,
+                             Gt, In, Invert, K, Le, List, Lt, MISSING, Merge,
+                             Mul, Ne, Neg, Omit, Or, Scope, Sub)
+from jsonbender.list_ops import (All, Any, Count, Distinct, Filter, FlatForall,
+                                 Forall, ForallBend, GroupBy, IndexBy, Join,
+                                 Max, Min, Reduce, Sum)
+from jsonbender.selectors import CachedF, F, OptionalS, ProtectedF, S
+from jsonbender.stream import abend_stream
+from jsonbender.string_ops import Format, ProtectedFormat
+from jsonbender.test import EngineComparison, outcome, same_outcome
+
+hypothesis = pytest.importorskip('hypothesis')
+from hypothesis import HealthCheck, given, settings  # noqa: E402
+from hypothesis import strategies as st  # noqa: E402
+
+
+def abend_one(bender, source):
+    async def run():
+        async def sources():
+            yield source
+        return [out async for out in abend_stream(bender, sources())]
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run())[0]
+    finally:
+        loop.close()
+
+
+# Engines that must give the same results as the reference interpreter,
+# as functions of a bender and a source.
+ENGINES = {
+    'bend_many': lambda bender, source: bend_many(bender, [source])[0],
+    'abend_stream': abend_one,
+    'closure': lambda bender, source: ClosureEngine().compile(bender)(source),
+}
+
+
+def bend_record(output):
+    return lambda mapping, source: (
+        bend_many(mapping, [source], output=output)[0].to_dict())
+
+
+# Engines for Dict mappings, returning what the reference interpreter
+# returns, except that omitted keys are None (see omitted_as_none()).
+RECORD_ENGINES = {output: bend_record(output)
+                  for output in ['tuple', 'slots', 'dataclass']}
+
+
+def omitted_as_none(bender, value):
+    """The bent value of a Dict, with the keys it left out set to None."""
+    if not isinstance(bender, Dict):
+        return value
+    return {k: omitted_as_none(v, value[k]) if k in value else None
+            for k, v in bender.dict.items()}
+
+
+keys = st.sampled_from(['a', 'b', 'c'])
+indices = st.sampled_from(['a', 'b', 'c', 0, 1, -1])
+scalars = (st.none() | st.booleans() | st.integers(-100, 100) |
+           st.floats(-1e6, 1e6) | st.text(max_size=3))
+json_values = st.recursive(
+    scalars,
+    lambda children: (st.lists(children, max_size=3) |
+                      st.dictionaries(keys, children, max_size=3)),
+    max_leaves=10,
+)
+
+FUNCS = [len, str, bool, abs, sorted, operator.itemgetter('a'),
+         operator.itemgetter(0), lambda v: [v, v]]
+funcs = st.sampled_from(FUNCS)
+paths = st.lists(indices, min_size=1, max_size=3)
+
+leaves = st.one_of(
+    st.builds(K, json_values),
+    paths.map(lambda p: S(*p)),
+    st.builds(lambda p, d: OptionalS(*p, default=d), paths, scalars),
+    funcs.map(F),
+    funcs.map(CachedF),
+    st.builds(lambda f, p: ProtectedF(f, protect_against=p), funcs, scalars),
+    st.just(Omit()),
+)
+
+
+def composites(benders):
+    pairs = st.tuples(benders, benders)
+    list_ops = st.one_of(
+        funcs.map(Forall), funcs.map(Filter), funcs.map(FlatForall),
+        st.just(Reduce(operator.add)),
+        st.builds(lambda i: Reduce(operator.add, initial=i), json_values),
+        st.sampled_from([Count(), Sum(), Min(), Max(), Any(), All(),
+                         Distinct()]),
+        st.builds(lambda cls, f: cls(f),
+                  st.sampled_from([Count, Sum, Min, Max, Any, All, Distinct,
+                                   GroupBy, IndexBy]),
+                  funcs),
+        st.dictionaries(keys, benders, max_size=2).map(ForallBend),
+    )
+    return st.one_of(
+        pairs.map(lambda p: Compose(*p)),
+        st.builds(Scope, benders, st.dictionaries(keys, benders, max_size=2)),
+        st.builds(lambda op, p: op(*p),
+                  st.sampled_from([Add, Sub, Mul, Div, FloorDiv, Eq, Ne, Lt,
+                                   Le, Gt, Ge, In, And, Or]),
+                  pairs),
+        st.builds(lambda op, b: op(b), st.sampled_from([Neg, Invert]),
+                  benders),
+        st.builds(lambda b, i: b[i], benders, indices),
+        st.dictionaries(keys, benders, max_size=3).map(Dict),
+        st.lists(benders, max_size=3).map(List),
+        st.lists(benders, min_size=1, max_size=3).map(lambda bs: Merge(*bs)),
+        st.builds(If, benders, benders, benders),
+        st.lists(benders, max_size=3).map(lambda bs: Alternation(*bs)),
+        st.builds(Switch, benders,
+                  st.dictionaries(scalars, benders, max_size=2),
+                  st.none() | benders),
+        st.builds(When, benders, benders),
+        benders.map(OmitIfMissing),
+        st.builds(lambda cls, p: cls('{}-{x}', p[0], x=p[1]),
+                  st.sampled_from([Format, ProtectedFormat]), pairs),
+        st.builds(Compose, benders, list_ops),
+        st.builds(lambda p, on, how: Join(p[0], p[1], on, how), pairs,
+                  funcs | st.tuples(funcs, funcs),
+                  st.sampled_from(['inner', 'left'])),
+    )
+
+
+benders = st.recursive(leaves, composites, max_leaves=12)
+mappings = st.dictionaries(keys, benders, min_size=1, max_size=3).map(Dict)
+
+examples = settings(max_examples=300, deadline=None,
+                    suppress_health_check=list(HealthCheck))
+
+
+class TestEngines(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.comparison = EngineComparison(ENGINES)
+
+    @classmethod
+    def tearDownClass(cls):
+        for name, ratio in sorted(cls.comparison.relative_speed().items()):
+            sys.stderr.write('\n{}: {:.2f}x the reference time'
+                             .format(name, ratio))
+
+    @examples
+    @given(benders, json_values)
+    def test_benders(self, bender, source):
+        self.comparison.check(bender, source)
+
+    @examples
+    @given(mappings, json_values)
+    def test_mappings(self, mapping, source):
+        self.comparison.check(mapping, source)
+
+
+class TestRecords(unittest.TestCase):
+    @examples
+    @given(mappings, json_values)
+    def test_records_match_dicts(self, mapping, source):
+        expected = outcome(mapping.bend, source)
+        if expected[0] == 'value':
+            expected = ('value', omitted_as_none(mapping, expected[1]))
+        for name, engine in RECORD_ENGINES.items():
+            got = outcome(engine, mapping, source)
+            self.assertTrue(same_outcome(expected, got),
+                            '{} gave {!r} instead of {!r}'
+                            .format(name, got, expected))
+
+
+class TestProbe(unittest.TestCase):
+    @examples
+    @given(benders, json_values)
+    def test_probe_agrees_with_bend(self, bender, source):
+        expected = outcome(bender.bend, source)
+        got = outcome(bender.probe, source)
+        if got == ('value', MISSING):
+            self.assertEqual(expected[0], 'error')
+            self.assertTrue(issubclass(expected[1], LookupError))
+        elif expected[0] == 'error' and issubclass(expected[1], LookupError):
+            # Benders without a probe() of their own may only miss.
+            self.assertEqual(got, ('value', MISSING))
+        else:
+            self.assertTrue(same_outcome(expected, got), (expected, got))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from jsonbender import Bender, F, K, S, OptionalS
+from jsonbender.control_flow import If, When
+from jsonbender.core import BendingException, benderify
+from jsonbender.engine import (ClosureEngine, Engine, ReferenceEngine,
+                               select_engine)
+from jsonbender.list_ops import ForallBend
+
+
+class Double(Bender):
+    def __init__(self, bender):
+        self.bender = benderify(bender)
+
+    def bend(self, source):
+        return self.bender.bend(source) * 2
+
+
+class TestEngines(unittest.TestCase):
+    mapping = {
+        'name': S('first') + K(' ') + S('last'),
+        'age': S('age') >> F(int),
+        'adult': If(S('age') >> F(int) >= 18, K(True), K(False)),
+        'ratio': S('age') >> F(int) // 10,
+        'opt': OptionalS('missing', default=1),
+        'email': When(S('has_email'), S('email')),
+        'tags': S('tags') >> ForallBend({'t': S('name')}),
+        'list': [S('first'), K(1)],
+    }
+    source = {'first': 'Li', 'last': 'Na', 'age': '42', 'has_email': False,
+              'tags': [{'name': 'a'}]}
+    expected = {'name': 'Li Na', 'age': 42, 'adult': True, 'ratio': 4,
+                'opt': 1, 'tags': [{'t': 'a'}], 'list': ['Li', 1]}
+
+    def test_engines(self):
+        for engine in (ReferenceEngine(), ClosureEngine()):
+            self.assertEqual(engine.bend(self.mapping, self.source),
+                             self.expected)
+
+    def test_errors(self):
+        func = ClosureEngine().compile({'a': {'b': S('x')}})
+        with self.assertRaises(BendingException) as ctx:
+            func({})
+        self.assertEqual(ctx.exception.path, ('a', 'b'))
+
+    def test_closure_engine_unwraps_f(self):
+        self.assertIs(ClosureEngine().compile(F(len)), len)
+
+    def test_unregistered_benders_use_bend(self):
+        engine = ClosureEngine()
+        bender = Double(S('a'))
+        self.assertEqual(engine.compile(bender), bender.bend)
+        self.assertEqual(engine.bend({'x': Double(S('a'))}, {'a': 2}),
+                         {'x': 4})
+
+    def test_register(self):
+        class MyEngine(ClosureEngine):
+            pass
+
+        @MyEngine.register(Double)
+        def compile_double(engine, bender):
+            inner = engine.compile(bender.bender)
+            return lambda source: inner(source) * 2
+
+        self.assertIn(Double, MyEngine.handlers)
+        self.assertNotIn(Double, ClosureEngine.handlers)
+        self.assertNotIn(Double, Engine.handlers)
+        self.assertEqual(MyEngine().bend({'x': Double(S('a'))}, {'a': 2}),
+                         {'x': 4})
+
+    def test_select_engine(self):
+        engines = [ReferenceEngine(), ClosureEngine()]
+        engine, func = select_engine(self.mapping, [self.source],
+                                     engines=engines)
+        self.assertIn(engine, engines)
+        self.assertEqual(func(self.source), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
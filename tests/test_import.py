@@ -0,0 +1,65 @@
+import subprocess
+import sys
+import unittest
+
+import jsonbender
+
+
+def run_python(code):
+    return subprocess.check_output([sys.executable, '-c', code],
+                                   universal_newlines=True).strip()
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'needs module __getattr__')
+class TestLazyImport(unittest.TestCase):
+    def loaded_submodules(self, code):
+        return run_python(
+            'import sys, jsonbender;' + code + ';'
+            'print(sorted(m for m in sys.modules'
+            '             if m.startswith("jsonbender")))'
+        )
+
+    def test_import_loads_no_submodules(self):
+        self.assertEqual(self.loaded_submodules('pass'), "['jsonbender']")
+
+    def test_attribute_loads_only_its_submodule(self):
+        out = self.loaded_submodules('jsonbender.Format')
+        self.assertNotIn('jsonbender.batch', out)
+        self.assertNotIn('jsonbender.list_ops', out)
+        self.assertIn('jsonbender.string_ops', out)
+
+    def test_submodule_attribute(self):
+        out = self.loaded_submodules('jsonbender.list_ops.ForallBend')
+        self.assertIn('jsonbender.list_ops', out)
+        self.assertNotIn('jsonbender.batch', out)
+
+    def test_bend_many_does_not_load_bend_file_dependencies(self):
+        out = run_python(
+            'import sys; from jsonbender import bend_many;'
+            'print(sorted({"mmap", "multiprocessing", "tempfile"}'
+            '             & set(sys.modules)))'
+        )
+        self.assertEqual(out, '[]')
+
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, jsonbender, 'nope')
+
+    def test_all_exports(self):
+        for name in jsonbender.__all__:
+            self.assertTrue(hasattr(jsonbender, name), name)
+        self.assertIn('S', dir(jsonbender))
+
+    def test_import_time(self):
+        # Not a strict benchmark: catches regressions like eagerly importing
+        # a heavy optional backend.
+        seconds = float(run_python(
+            'from time import perf_counter; start = perf_counter();'
+            'import jsonbender; print(perf_counter() - start)'
+        ))
+        sys.stderr.write('\nimport jsonbender: {:.2f}ms\n'
+                         .format(seconds * 1000))
+        self.assertLess(seconds, 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,9 @@ from operator import add
 import unittest
 
 from jsonbender import K, S, bend
-from jsonbender.list_ops import Forall, ForallBend, FlatForall, Filter, ListOp, Reduce
+from jsonbender.list_ops import (Forall, ForallBend, FlatForall, Filter,
+                                 ListOp, Reduce, Count, Sum, Min, Max, Any,
+                                 All, Distinct, GroupBy, IndexBy, Join)
 from jsonbender.test import BenderTestMixin
 
 
@@ -45,6 +47,15 @@ class TestReduce(ListOpTestCase):
     def test_nonempty_list(self):
         self.assert_list_op(range(1, 5), add, 10)
 
+    def test_initial(self):
+        self.assert_bender(Reduce(add, initial=0), [], 0)
+        self.assert_bender(Reduce(add, initial=10), [1, 2], 13)
+        self.assert_bender(Reduce(lambda acc, i: acc + [i], initial=[]),
+                           (1, 2), [1, 2])
+
+    def test_unexpected_kwargs(self):
+        self.assertRaises(TypeError, Reduce, add, start=0)
+
     def test_compatibility(self):
         # TODO: remove this when compatibility is broken
         bender = self.cls(K([1, 2]), add)
@@ -89,6 +100,119 @@ class TestFlatForall(ListOpTestCase):
         self.assert_bender(bender, {}, [1])
 
 
+class TestAggregates(unittest.TestCase, BenderTestMixin):
+    def test_count(self):
+        self.assert_bender(Count(), [], 0)
+        self.assert_bender(Count(), [1, 2, 3], 3)
+        self.assert_bender(Count(), iter([1, 2, 3]), 3)
+        self.assert_bender(Count(lambda i: i > 1), [1, 2, 3], 2)
+
+    def test_sum(self):
+        self.assert_bender(Sum(), [], 0)
+        self.assert_bender(Sum(), [1, 2, 3], 6)
+        self.assert_bender(Sum(S('price')), [{'price': 2}, {'price': 3}], 5)
+
+    def test_min_max(self):
+        self.assert_bender(Min(), [3, 1, 2], 1)
+        self.assert_bender(Max(), [3, 1, 2], 3)
+        self.assert_bender(Max(lambda d: d['a']), [{'a': 1}, {'a': 4}], 4)
+        self.assertRaises(ValueError, Min().bend, [])
+        self.assertRaises(ValueError, Max().bend, [])
+
+    def test_any_all(self):
+        self.assert_bender(Any(), [], False)
+        self.assert_bender(All(), [], True)
+        self.assert_bender(Any(lambda i: i > 2), [1, 2, 3], True)
+        self.assert_bender(All(lambda i: i > 2), [1, 2, 3], False)
+
+    def test_any_all_short_circuit(self):
+        seen = []
+
+        def check(i):
+            seen.append(i)
+            return i > 1
+        self.assert_bender(Any(check), [1, 2, 3, 4], True)
+        self.assertEqual(seen, [1, 2])
+        del seen[:]
+        self.assert_bender(All(check), [2, 1, 3], False)
+        self.assertEqual(seen, [2, 1])
+
+    def test_distinct(self):
+        self.assert_bender(Distinct(), [1, 2, 1, 3, 2], [1, 2, 3])
+        self.assert_bender(Distinct(S('id')),
+                           [{'id': 1, 'v': 'a'}, {'id': 1, 'v': 'b'}],
+                           [{'id': 1, 'v': 'a'}])
+
+    def test_group_by(self):
+        items = [{'type': 'a', 'v': 1},
+                 {'type': 'b', 'v': 2},
+                 {'type': 'a', 'v': 3}]
+        expected = {'a': [{'type': 'a', 'v': 1}, {'type': 'a', 'v': 3}],
+                    'b': [{'type': 'b', 'v': 2}]}
+        self.assert_bender(GroupBy(S('type')), items, expected)
+        self.assert_bender(GroupBy(lambda d: d['type']), items, expected)
+        self.assert_bender(GroupBy(S('type')), [], {})
+
+    def test_composition(self):
+        b = S('items') >> Sum(S('qty') * S('price'))
+        self.assert_bender(b, {'items': [{'qty': 2, 'price': 3},
+                                         {'qty': 1, 'price': 4}]}, 10)
+
+
+class TestIndexBy(unittest.TestCase, BenderTestMixin):
+    def test_index(self):
+        items = [{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'b'}, {'id': 1, 'v': 'c'}]
+        self.assert_bender(IndexBy(S('id')), items,
+                           {1: {'id': 1, 'v': 'c'}, 2: {'id': 2, 'v': 'b'}})
+        self.assert_bender(IndexBy(S('id')), [], {})
+
+
+class TestJoin(unittest.TestCase, BenderTestMixin):
+    def setUp(self):
+        self.source = {
+            'line_items': [{'product_id': 2, 'qty': 3},
+                           {'product_id': 3, 'qty': 1},
+                           {'product_id': 1, 'qty': 5}],
+            'products': [{'id': 1, 'name': 'a'},
+                         {'id': 2, 'name': 'b'},
+                         {'id': 2, 'name': 'b2'}],
+        }
+
+    def test_inner(self):
+        join = Join(S('line_items'), S('products'),
+                    on=(S('product_id'), S('id')))
+        items = self.source['line_items']
+        products = self.source['products']
+        self.assert_bender(join, self.source,
+                           [(items[0], products[1]),
+                            (items[0], products[2]),
+                            (items[2], products[0])])
+
+    def test_left(self):
+        join = Join(S('line_items'), S('products'),
+                    on=(lambda d: d['product_id'], lambda d: d['id']),
+                    how='left')
+        got = join.bend(self.source)
+        self.assertEqual([(item['qty'], r and r['name']) for item, r in got],
+                         [(3, 'b'), (3, 'b2'), (1, None), (5, 'a')])
+
+    def test_same_key(self):
+        join = Join(S('a'), S('b'), on=S('id'))
+        source = {'a': [{'id': 1, 'x': 1}], 'b': [{'id': 1, 'y': 2}]}
+        self.assert_bender(join, source,
+                           [({'id': 1, 'x': 1}, {'id': 1, 'y': 2})])
+
+    def test_composition(self):
+        join = Join(S('line_items'), S('products'),
+                    on=(S('product_id'), S('id')))
+        names = join >> Forall(lambda p: p[1]['name'])
+        self.assert_bender(names, self.source, ['b', 'b2', 'a'])
+
+    def test_unknown_join_type(self):
+        self.assertRaises(ValueError, Join, S('a'), S('b'), on=S('id'),
+                          how='outer')
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,115 @@
+from threading import Thread
+import unittest
+
+from jsonbender import S, bend
+from jsonbender import metrics
+from jsonbender.batch import bend_columns
+from jsonbender.core import BendingException
+from jsonbender.metrics import Collector, Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(Histogram().percentile(50), 0)
+
+    def test_percentiles(self):
+        h = Histogram(unit=1)
+        for v in range(1, 1001):
+            h.record(v)
+        self.assertEqual(h.count, 1000)
+        for p, expected in [(50, 500), (90, 900), (99, 990), (100, 1000)]:
+            self.assertAlmostEqual(h.percentile(p), expected,
+                                   delta=expected / 100.0)
+
+    def test_microsecond_latencies(self):
+        h = Histogram()
+        values = [2.96e-6, 3.1e-6, 4.75e-6, 1.23e-3]
+        for v in values:
+            h.record(v)
+        for p, expected in [(25, 2.96e-6), (50, 3.1e-6), (75, 4.75e-6),
+                            (100, 1.23e-3)]:
+            self.assertGreaterEqual(h.percentile(p), expected)
+            self.assertLess(h.percentile(p), expected * 1.01)
+
+    def test_small_values_are_exact(self):
+        h = Histogram(unit=1)
+        for v in [3, 1, 2]:
+            h.record(v)
+        self.assertEqual(h.percentile(50), 2)
+        self.assertEqual(h.percentile(100), 3)
+
+
+class TestCollector(unittest.TestCase):
+    def setUp(self):
+        self.collector = Collector(label=lambda m: 'names')
+        self.old_hook = metrics.set_hook(self.collector)
+
+    def tearDown(self):
+        metrics.set_hook(self.old_hook)
+
+    def test_bend(self):
+        mapping = {'name': S('name'), 'nested': {'id': S('id')}}
+        bend(mapping, {'name': 'a', 'id': 1})
+        self.assertRaises(BendingException, bend, mapping, {'id': 1})
+        self.assertRaises(BendingException, bend, mapping, {'name': 'a'})
+        self.assertRaises(BendingException, bend, mapping, {'name': 'a'})
+
+        stats = self.collector.stats[('bend', 'names')]
+        self.assertEqual(stats.calls, 4)
+        self.assertEqual(stats.records, 4)
+        self.assertEqual(stats.latency.count, 4)
+        self.assertEqual(dict(stats.errors), {'name': 1, 'nested': 2})
+        self.assertGreater(self.collector.throughput('bend', 'names'), 0)
+
+    def test_bend_columns(self):
+        bend_columns({'name': S('name')}, [{'name': 'a'}, {'name': 'b'}])
+        stats = self.collector.stats[('bend_columns', 'names')]
+        self.assertEqual(stats.calls, 1)
+        self.assertEqual(stats.records, 2)
+
+    def test_export(self):
+        mapping = {'name': S('name')}
+        bend(mapping, {'name': 'a'})
+        self.assertRaises(BendingException, bend, mapping, {})
+        exported = []
+        self.collector.export(lambda *args: exported.append(args))
+        names = [name for name, _, _ in exported]
+        self.assertEqual(names.count('jsonbender_latency_seconds'),
+                         len(Collector.percentiles))
+        labels = {'entry_point': 'bend', 'mapping': 'names'}
+        self.assertIn(('jsonbender_calls_total', 2, labels), exported)
+        self.assertIn(('jsonbender_errors_total', 1, dict(labels, key='name')),
+                      exported)
+
+    def test_export_while_recording(self):
+        self.collector.record('bend', {}, 1, 0.001)
+        keys = iter(range(100))
+
+        def callback(name, value, labels):
+            # as an executor thread could
+            error = BendingException(path=(next(keys),))
+            self.collector.record('bend', {}, 1, 0.001, error)
+
+        self.collector.export(callback)
+
+    def test_concurrent_records(self):
+        def record():
+            for _ in range(1000):
+                self.collector.record('bend', {}, 1, 0.001)
+
+        threads = [Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = self.collector.stats[('bend', 'names')]
+        self.assertEqual((stats.calls, stats.latency.count), (4000, 4000))
+
+
+class TestNoHook(unittest.TestCase):
+    def test_no_hook_by_default(self):
+        self.assertIsNone(metrics.hook)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
 import unittest
 
-from jsonbender.core import K
-from jsonbender.selectors import F, ProtectedF, S, OptionalS
+from collections import defaultdict, OrderedDict
+from threading import Thread
+
+from jsonbender.core import K, MISSING
+from jsonbender.selectors import (F, ProtectedF, CachedF, LRUCache, S,
+                                  OptionalS)
 from jsonbender.test import BenderTestMixin
 
 
@@ -35,6 +39,20 @@ class TestS(unittest.TestCase, STestsMixin):
     def test_deep_missing_field(self):
         self.assertRaises(KeyError, self.selector_cls('k', 'k2').bend, {'k': {}})
 
+    def test_probe(self):
+        s = self.selector_cls('a', 1, 'b')
+        self.assertEqual(s.probe({'a': [{}, {'b': 'ok!'}]}), 'ok!')
+        self.assertIs(s.probe({}), MISSING)
+        self.assertIs(s.probe({'a': [{}]}), MISSING)
+        self.assertIs(s.probe({'a': ({}, {})}), MISSING)
+        self.assertIs(s.probe({'a': OrderedDict()}), MISSING)
+        self.assertEqual(self.selector_cls(-1).probe([1, 2]), 2)
+        self.assertIs(self.selector_cls(-3).probe([1, 2]), MISSING)
+
+    def test_probe_respects_missing(self):
+        source = defaultdict(lambda: 'default')
+        self.assertEqual(self.selector_cls('k').probe(source), 'default')
+
 
 class TestOptionalS(unittest.TestCase, STestsMixin):
     selector_cls = OptionalS
@@ -53,6 +71,9 @@ class TestOptionalS(unittest.TestCase, STestsMixin):
     def test_activate_on_IndexError(self):
         self.assert_bender(OptionalS(0), [], None)
 
+    def test_probe_never_misses(self):
+        self.assertEqual(OptionalS('a', default=1).probe({}), 1)
+
 
 class FTestsMixin(BenderTestMixin):
     def test_f(self):
@@ -91,6 +112,87 @@ class TestProtectedF(unittest.TestCase, FTestsMixin):
         self.assert_bender(protected, None, None)
 
 
+class TestCachedF(unittest.TestCase, FTestsMixin):
+    selector_cls = CachedF
+
+    def setUp(self):
+        self.calls = []
+
+    def func(self, value, *args, **kwargs):
+        self.calls.append(value)
+        return (value, args, kwargs)
+
+    def test_cache_hits(self):
+        f = CachedF(self.func)
+        for v in ['a', 'b', 'a', 'a']:
+            self.assertEqual(f.bend(v), (v, (), {}))
+        self.assertEqual(self.calls, ['a', 'b'])
+        self.assertEqual((f.cache.hits, f.cache.misses), (2, 2))
+
+    def test_key_includes_args(self):
+        cache = LRUCache()
+        f1 = CachedF(self.func, 1, cache=cache)
+        f2 = CachedF(self.func, 2, cache=cache)
+        f3 = CachedF(self.func, 2, k='v', cache=cache)
+        self.assertEqual(f1.bend('a'), ('a', (1,), {}))
+        self.assertEqual(f2.bend('a'), ('a', (2,), {}))
+        self.assertEqual(f3.bend('a'), ('a', (2,), {'k': 'v'}))
+        self.assertEqual(CachedF(self.func, 2, cache=cache).bend('a'),
+                         ('a', (2,), {}))
+        self.assertEqual(len(self.calls), 3)
+
+    def test_key_includes_type(self):
+        f = CachedF(self.func)
+        self.assertIs(type(f.bend(1)[0]), int)
+        self.assertIs(type(f.bend(1.0)[0]), float)
+
+    def test_maxsize(self):
+        f = F(self.func).cached(maxsize=2)
+        for v in [1, 2, 1, 3, 2, 1]:
+            f.bend(v)
+        self.assertEqual(self.calls, [1, 2, 3, 2, 1])
+        self.assertEqual(len(f.cache), 2)
+
+    def test_ttl(self):
+        f = F(self.func).cached(ttl=-1)  # always expired
+        f.bend(1)
+        f.bend(1)
+        self.assertEqual(self.calls, [1, 1])
+
+    def test_unhashable_value(self):
+        f = CachedF(self.func)
+        f.bend([1])
+        f.bend([1])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_unhashable_params(self):
+        self.assertRaises(TypeError, CachedF, self.func, [])
+
+    def test_shared_between_threads(self):
+        cache = LRUCache(maxsize=8)
+        errors = []
+
+        def run():
+            try:
+                for i in range(2000):
+                    if cache.get(i % 10) is MISSING:
+                        cache.set(i % 10, i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 8000)
+        self.assertEqual(len(cache), 8)
+
+    def test_invalid_maxsize(self):
+        self.assertRaises(ValueError, LRUCache, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,134 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+
+from jsonbender import F, S
+from jsonbender import metrics
+from jsonbender.core import BendingException
+from jsonbender.metrics import Collector
+from jsonbender.stream import abend_stream
+
+
+async def aiter_(items, pulled=None, delay=0):
+    for item in items:
+        if pulled is not None:
+            pulled.append(item)
+        yield item
+        await asyncio.sleep(delay)
+
+
+def sleep_then(value):
+    # later records finish first
+    time.sleep(0.001 * (10 - value % 10))
+    return value
+
+
+class TestAbendStream(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(4)
+        self.sources = [{'v': i} for i in range(25)]
+        self.mapping = {'v': S('v') >> F(sleep_then)}
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.loop.close()
+
+    def collect(self, stream, consume=None):
+        async def run():
+            res = []
+            async for out in stream:
+                res.append(out)
+                if consume:
+                    consume(res)
+            return res
+        return self.loop.run_until_complete(run())
+
+    def test_ordered(self):
+        got = self.collect(abend_stream(self.mapping, aiter_(self.sources),
+                                        batch_size=3, executor=self.executor))
+        self.assertEqual(got, self.sources)
+
+    def test_unordered(self):
+        got = self.collect(abend_stream(self.mapping, aiter_(self.sources),
+                                        batch_size=1, ordered=False,
+                                        executor=self.executor))
+        self.assertEqual(sorted(got, key=lambda d: d['v']), self.sources)
+
+    def test_empty(self):
+        self.assertEqual(self.collect(abend_stream(self.mapping, aiter_([]))),
+                         [])
+
+    def test_backpressure(self):
+        pulled = []
+
+        def consume(res):
+            # at most max_in_flight batches, plus the one being read
+            self.assertLessEqual(len(pulled) - len(res), 2 * (3 + 1))
+
+        stream = abend_stream(self.mapping, aiter_(self.sources, pulled),
+                              batch_size=2, max_in_flight=3,
+                              executor=self.executor)
+        self.assertEqual(len(self.collect(stream, consume)), 25)
+
+    def test_done_batches_are_yielded_early(self):
+        for ordered in (True, False):
+            pulled = []
+
+            def consume(res):
+                # not held back until max_in_flight batches are pending
+                self.assertLessEqual(len(pulled) - len(res), 2)
+
+            stream = abend_stream({'v': S('v')},
+                                  aiter_(self.sources[:5], pulled, 0.02),
+                                  batch_size=1, max_in_flight=4,
+                                  ordered=ordered, executor=self.executor)
+            self.assertEqual(len(self.collect(stream, consume)), 5)
+
+    def test_idle_source(self):
+        async def idle():
+            yield {'v': 1}
+            await asyncio.sleep(1)
+            yield {'v': 2}
+
+        for batch_size in (1, 10):
+            async def first_result():
+                stream = abend_stream({'v': S('v')}, idle(),
+                                      batch_size=batch_size, max_delay=0.01,
+                                      executor=self.executor)
+                try:
+                    async for out in stream:
+                        return out
+                finally:
+                    await stream.aclose()
+
+            start = time.perf_counter()
+            self.assertEqual(self.loop.run_until_complete(first_result()),
+                             {'v': 1})
+            self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_error(self):
+        sources = self.sources + [{}]
+        stream = abend_stream(self.mapping, aiter_(sources), batch_size=4,
+                              executor=self.executor)
+        self.assertRaises(BendingException, self.collect, stream)
+
+    def test_invalid_parameters(self):
+        stream = abend_stream(self.mapping, aiter_([]), batch_size=0)
+        self.assertRaises(ValueError, self.collect, stream)
+
+    def test_metrics(self):
+        collector = Collector()
+        old = metrics.set_hook(collector)
+        try:
+            self.collect(abend_stream(self.mapping, aiter_(self.sources),
+                                      batch_size=10, executor=self.executor))
+        finally:
+            metrics.set_hook(old)
+        stats = collector.stats[('abend_stream', None)]
+        self.assertEqual((stats.calls, stats.records), (3, 25))
+
+
+if __name__ == '__main__':
+    unittest.main()
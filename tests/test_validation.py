@@ -0,0 +1,52 @@
+import unittest
+
+from jsonbender import F, K, S, OptionalS
+from jsonbender.control_flow import OmitIfMissing
+from jsonbender.string_ops import Format
+from jsonbender.validation import check
+
+
+class TestCheck(unittest.TestCase):
+    def test_ok(self):
+        mapping = {'name': S('name'), 'nested': {'id': S('id')}}
+        report = check(mapping, [{'name': 'a', 'id': 1},
+                                 {'name': 'b', 'id': 2}])
+        self.assertTrue(report.ok)
+        self.assertEqual(list(report.keys), [('name',), ('nested', 'id')])
+        self.assertEqual(report.schema, {('name',): ['str'],
+                                         ('nested', 'id'): ['int']})
+        self.assertEqual(report.samples, 2)
+        self.assertGreater(report.keys[('name',)].seconds, 0)
+
+    def test_failures(self):
+        mapping = {'ratio': S('a') / S('b'),
+                   'label': Format('{name}', name=S('name')),
+                   'const': K(1)}
+        report = check(mapping, [{'a': 1, 'b': 2, 'name': 'x'},
+                                 {'a': 1, 'b': 'nope'}])
+        self.assertFalse(report.ok)
+        failed = {r.path: [i for i, _ in r.errors] for r in report.failures}
+        self.assertEqual(failed, {('ratio',): [1], ('label',): [1]})
+        self.assertIn('FAIL ratio', str(report))
+        self.assertIn('ok const', str(report))
+
+    def test_inconsistent_types(self):
+        mapping = {'v': S('v'), 'opt': OptionalS('opt')}
+        report = check(mapping, [{'v': 1, 'opt': 'x'}, {'v': '1'}])
+        self.assertEqual([r.path for r in report.inconsistent], [('v',)])
+        self.assertTrue(report.keys[('opt',)].nullable)
+        self.assertTrue(report.keys[('opt',)].consistent)
+
+    def test_omitted_values_are_not_counted(self):
+        mapping = {'email': OmitIfMissing(S('email'))}
+        report = check(mapping, [{'email': 'a'}, {}])
+        self.assertTrue(report.ok)
+        self.assertEqual(report.schema, {('email',): ['str']})
+
+    def test_non_dict_mapping(self):
+        report = check(S('a') >> F(len), [{'a': [1]}])
+        self.assertEqual(report.schema, {(): ['int']})
+
+
+if __name__ == '__main__':
+    unittest.main()